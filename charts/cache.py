@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+from market_data.singleflight import SingleFlight
+
+
+def frame_key(ticker, interval, data):
+    """
+    Content address of a bar frame: (ticker, interval, last bar, content hash).
+
+    The hash covers the index and every value, so a revised bar or a
+    different period produces a new key even if the last bar is unchanged.
+    """
+    if data.empty:
+        return (ticker, interval, None, None)
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    digest.update("\0".join(map(str, data.columns)).encode("utf-8"))
+    return (ticker, interval, data.index[-1].isoformat(), digest.hexdigest())
+
+
+class ComputeCache:
+    """
+    Thread-safe LRU of derived results (indicator frames, built figures) keyed by content.
+
+    Values are shared across sessions and must be treated as read-only.
+    Concurrent builds of one key (e.g. a background prefetch and the render
+    that needs it) run once and share the result.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        return self._flight.do(key, lambda: self._build(key, build))
+
+    def prefetch(self, key, build):
+        """Build `key` on a background thread unless it is cached; returns the Future, or None if cached."""
+        with self._lock:
+            if key in self._entries:
+                return None
+        return _prefetch_pool.submit(self.get_or_build, key, build)
+
+    def _build(self, key, build):
+        with self._lock:
+            # Another build of this key may have finished since the caller missed
+            if key in self._entries:
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# One worker: prefetches are speculative and should not compete with the render for the GIL
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-prefetch")
+
+indicator_cache = ComputeCache(maxsize=128)
+figure_cache = ComputeCache(maxsize=64)
+
+_theme_lock = threading.Lock()
+
+
+@contextmanager
+def themed(fig, template):
+    """
+    Apply `template` to a cached figure for the duration of the block.
+
+    Figures are cached without regard to theme, so switching light/dark mode
+    only swaps the template instead of rebuilding every trace. The lock keeps
+    concurrent sessions from serializing a figure with each other's theme.
+    """
+    with _theme_lock:
+        fig.layout.template = template
+        yield fig
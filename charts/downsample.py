@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+def bucket_starts(n, max_points):
+    """Start positions of consecutive equal-sized buckets that cut `n` rows to at most `max_points`."""
+    size = -(-n // max_points)
+    return np.arange(0, n, size)
+
+
+def resample_ohlc(data, max_points):
+    """
+    Re-aggregate bars into at most `max_points` candles.
+
+    Consecutive bars are merged into equal-sized buckets: first Open, highest
+    High, lowest Low, last Close and summed Volume, stamped with the bucket's
+    first timestamp. Frames already within budget are returned unchanged.
+    """
+    if not max_points or len(data) <= max_points:
+        return data
+    starts = bucket_starts(len(data), max_points)
+    ends = np.r_[starts[1:], len(data)] - 1
+    columns = {
+        "Open": data["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(data["High"].to_numpy(dtype="float64"), starts),
+        "Low": np.minimum.reduceat(data["Low"].to_numpy(dtype="float64"), starts),
+        "Close": data["Close"].to_numpy()[ends],
+    }
+    if "Volume" in data.columns:
+        columns["Volume"] = np.add.reduceat(data["Volume"].to_numpy(dtype="float64"), starts)
+    return pd.DataFrame(columns, index=data.index[starts])
+
+
+def resample_mean(series, max_points):
+    """Average a series (e.g. a histogram) over equal-sized buckets of at most `max_points`."""
+    if not max_points or len(series) <= max_points:
+        return series
+    starts = bucket_starts(len(series), max_points)
+    values = series.to_numpy(dtype="float64")
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    counts = np.add.reduceat(valid.astype("int64"), starts)
+    with np.errstate(invalid="ignore"):
+        return pd.Series(sums / counts, index=series.index[starts], name=series.name)
+
+
+def lttb_indices(y, max_points):
+    """
+    Largest-Triangle-Three-Buckets: positions of the `max_points` samples that best keep the shape of `y`.
+
+    x is taken as the sample position, which is what a time axis of regular
+    bars looks like once weekends and nights are ignored. The first and last
+    samples are always kept.
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype="float64")
+    edges = np.linspace(1, n - 1, max_points - 1).astype("int64")
+    selected = np.empty(max_points, dtype="int64")
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket's average is the third corner of each candidate triangle
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_line(series, max_points):
+    """Reduce a line overlay to at most `max_points` points with LTTB, ignoring its NaN warm-up."""
+    if not max_points or len(series) <= max_points:
+        return series
+    values = series.dropna()
+    if len(values) <= max_points:
+        return values
+    keep = lttb_indices(values.to_numpy(dtype="float64"), max_points)
+    return values.iloc[keep]
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from charts.downsample import downsample_line
+
+
+# Line overlays with more points than this are drawn with WebGL instead of SVG
+WEBGL_MIN_POINTS = 1000
+
+
+def compact_dates(index):
+    """
+    x values for a time axis as short date strings.
+
+    Daily bars become "YYYY-MM-DD" and intraday bars "YYYY-MM-DDTHH:MM:SS"
+    without the UTC offset, which plotly ignores anyway (it draws wall-clock
+    time). The default ISO timestamps with offset are about twice as long
+    and dominate the JSON payload of a long chart.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    stamps = index.to_numpy()
+    daily = bool((stamps == stamps.astype("datetime64[D]")).all())
+    return np.datetime_as_string(stamps, unit="D" if daily else "s")
+
+
+def values(series, dtype="float64"):
+    """Values of a trace column as a NumPy array, which plotly ships as a base64 typed array rather than JSON numbers."""
+    return series.to_numpy(dtype=dtype, na_value=np.nan)
+
+
+def line_trace(series, max_points=None, **kwargs):
+    """
+    A line overlay for `series`, reduced to `max_points` with LTTB.
+
+    Lines still longer than WEBGL_MIN_POINTS become Scattergl traces, which
+    render with WebGL and stay smooth while panning; shorter ones stay SVG
+    Scatter traces. Overlays are smoothed, derived values, so they are sent
+    as float32, half the bytes of float64 and still ~7 significant digits.
+    Other keyword arguments go to the trace.
+    """
+    series = downsample_line(series, max_points)
+    trace = go.Scattergl if len(series) > WEBGL_MIN_POINTS else go.Scatter
+    return trace(x=compact_dates(series.index), y=values(series, "float32"), **kwargs)
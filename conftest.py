@@ -0,0 +1,58 @@
+"""
+Shared test fixtures: synthetic OHLCV bars and a fake bar store
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def bars_from_close(close=None, index=None, volume=1000.0, spread=0.01):
+    """
+    OHLCV frame built around `close`, shaped like the bar store's frames.
+
+    Open is the close and High/Low sit `spread` above and below it. The
+    index defaults to business days ending 2025-03-31; without `close` the
+    bars rise by 1.0 a bar from 100 over the given `index`.
+    """
+    if close is None:
+        close = 100.0 + np.arange(len(index))
+    close = np.asarray(close, dtype="float64")
+    if index is None:
+        index = pd.bdate_range(end="2025-03-31", periods=len(close))
+    return pd.DataFrame({
+        "Open": close, "High": close * (1 + spread), "Low": close * (1 - spread), "Close": close, "Volume": volume,
+    }, index=index)
+
+
+def random_walk(periods, seed=0, vol=0.01):
+    """Closes of a driftless geometric random walk starting near 100; the same seed gives the same path."""
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, vol, periods)))
+
+
+class FakeStore:
+    """Stands in for BarStore.history_many: serves fixed frames and records the tickers of each request."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def history_many(self, tickers, period="1y", interval="1d"):
+        self.calls.append(list(tickers))
+        return {t: self.frames.get(t, pd.DataFrame()) for t in tickers}
+
+
+@pytest.fixture
+def make_bars():
+    return bars_from_close
+
+
+@pytest.fixture
+def random_closes():
+    return random_walk
+
+
+@pytest.fixture
+def fake_store():
+    return FakeStore
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators.streaming import STREAMING_COLUMNS
+from market_data.bar_store import bar_panels
+
+
+PANEL_COLUMNS = tuple(STREAMING_COLUMNS)
+
+
+def rolling_mean(x, window):
+    """Rolling mean down axis 0 from cumulative sums; NaN until `window` finite values fill the window."""
+    valid = ~np.isnan(x)
+    sums = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+    window_sums = sums[window - 1:].copy()
+    window_sums[1:] -= sums[:-window]
+    window_counts = counts[window - 1:].copy()
+    window_counts[1:] -= counts[:-window]
+    out[window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return out
+
+
+def rolling_std(x, window):
+    """Rolling sample standard deviation down axis 0, from centred cumulative sums of x and x**2."""
+    # Centring each column first keeps the sum-of-squares subtraction numerically stable
+    valid = ~np.isnan(x)
+    centred = x - np.where(valid, x, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    mean = rolling_mean(centred, window)
+    mean_sq = rolling_mean(centred ** 2, window)
+    var = (mean_sq - mean ** 2) * window / (window - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def rolling_extreme(x, window, reduce):
+    """Rolling max or min (`reduce` is np.max / np.min) down axis 0; NaN windows give NaN."""
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = reduce(sliding_window_view(x, window, axis=0), axis=-1)
+    return out
+
+
+def ewm_mean(x, span):
+    """pandas-compatible `ewm(span=span).mean()` (adjust=True) down axis 0, vectorised across columns."""
+    decay = 1 - 2 / (span + 1)
+    valid = ~np.isnan(x)
+    values = np.where(valid, x, 0.0)
+    num = np.empty(x.shape)
+    den = np.empty(x.shape)
+    num_t = np.zeros(x.shape[1:])
+    den_t = np.zeros(x.shape[1:])
+    # The recursion runs over time only; each step is one vector operation across all tickers
+    for t in range(len(x)):
+        num[t] = num_t = values[t] + decay * num_t
+        den[t] = den_t = valid[t] + decay * den_t
+    with np.errstate(invalid="ignore"):
+        return num / den
+
+
+@dataclass(frozen=True)
+class IndicatorPanel:
+    """
+    Indicators for many tickers as one float32 (indicator x time x ticker) cube.
+
+    `names` lists the indicator axis in the order of PANEL_COLUMNS. Keeping
+    the indicator axis outermost makes every (time x ticker) slice contiguous.
+    """
+    cube: np.ndarray
+    index: pd.Index
+    tickers: tuple
+    names: tuple = PANEL_COLUMNS
+
+    def get(self, name):
+        """One indicator as a (time x ticker) DataFrame."""
+        return pd.DataFrame(self.cube[self.names.index(name)], index=self.index, columns=list(self.tickers))
+
+    def latest(self):
+        """The last row of every indicator as a (ticker x indicator) DataFrame."""
+        return pd.DataFrame(self.cube[:, -1, :].T, index=list(self.tickers), columns=list(self.names))
+
+
+def compute_panel(high, low, close):
+    """
+    Compute every indicator of calculate_technical_indicators for all tickers at once.
+
+    `high`, `low` and `close` are aligned (time x ticker) arrays or DataFrames.
+    Each indicator is a handful of whole-panel NumPy operations, so the cost
+    grows with the panel size rather than with the number of tickers times
+    the per-ticker pandas overhead.
+    """
+    index = close.index if isinstance(close, pd.DataFrame) else pd.RangeIndex(len(close))
+    tickers = tuple(close.columns) if isinstance(close, pd.DataFrame) else tuple(range(np.shape(close)[1]))
+    high, low, close = (np.asarray(a, dtype="float64") for a in (high, low, close))
+
+    v = {}
+    for n in (20, 50, 200):
+        v[f"SMA_{n}"] = rolling_mean(close, n)
+    for n in (12, 26, 50):
+        v[f"EMA_{n}"] = ewm_mean(close, n)
+
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    # Match pandas' `where`: a missing change counts as zero gain and zero loss
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v["RSI"] = 100 - 100 / (1 + gain / loss)
+
+        v["MACD"] = v["EMA_12"] - v["EMA_26"]
+        v["MACD_Signal"] = ewm_mean(v["MACD"], 9)
+        v["MACD_Histogram"] = v["MACD"] - v["MACD_Signal"]
+
+        v["BB_Middle"] = v["SMA_20"]
+        bb_std = rolling_std(close, 20)
+        v["BB_Upper"] = v["BB_Middle"] + bb_std * 2
+        v["BB_Lower"] = v["BB_Middle"] - bb_std * 2
+
+        low_14 = rolling_extreme(low, 14, np.min)
+        high_14 = rolling_extreme(high, 14, np.max)
+        v["%K"] = 100 * ((close - low_14) / (high_14 - low_14))
+        v["%D"] = rolling_mean(v["%K"], 3)
+
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[1:] = close[:-1]
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    v["ATR"] = rolling_mean(true_range, 14)
+
+    cube = np.empty((len(PANEL_COLUMNS),) + close.shape, dtype="float32")
+    for k, name in enumerate(PANEL_COLUMNS):
+        cube[k] = v[name]
+    return IndicatorPanel(cube=cube, index=index, tickers=tickers)
+
+
+def panel_from_frames(frames):
+    """Align {ticker: bars} on one date index and compute the indicator panel."""
+    panels = bar_panels(frames, ("High", "Low", "Close"))
+    return compute_panel(panels["High"], panels["Low"], panels["Close"])
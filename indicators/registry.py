@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+import pandas as pd
+
+
+BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    One node of the indicator graph.
+
+    `deps` name bar fields or other indicators; `compute` receives their
+    values positionally. Private nodes are intermediate results that are
+    shared between indicators but never added to the caller's frame.
+    """
+    name: str
+    deps: Tuple[str, ...]
+    compute: Callable
+    public: bool = True
+
+
+REGISTRY = {}
+
+
+def register(name, *deps, public=True):
+    """Decorator adding an indicator to REGISTRY."""
+    def decorator(compute):
+        REGISTRY[name] = Indicator(name, deps, compute, public)
+        return compute
+    return decorator
+
+
+def public_indicators():
+    """Names of every user-visible indicator, in registration order."""
+    return [name for name, spec in REGISTRY.items() if spec.public]
+
+
+def resolve(names):
+    """Return the nodes needed for `names` in dependency order, each exactly once."""
+    order = []
+    visiting = set()
+    done = set(BAR_FIELDS)
+
+    def visit(name):
+        if name in done:
+            return
+        if name not in REGISTRY:
+            raise KeyError(f"Unknown indicator: {name}")
+        if name in visiting:
+            raise ValueError(f"Indicator dependency cycle at {name}")
+        visiting.add(name)
+        for dep in REGISTRY[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def compute_indicators(data, names=None):
+    """
+    Return a copy of `data` with the requested indicator columns added.
+
+    Only the subgraph the requested indicators depend on is evaluated, and
+    shared nodes (e.g. SMA_20 for the Bollinger middle band) are computed
+    once. Intermediate nodes stay out of the returned frame. With no
+    `names`, every public indicator is added.
+    """
+    names = public_indicators() if names is None else list(dict.fromkeys(names))
+    if data.empty:
+        return data.copy()
+    values = {field: data[field] for field in BAR_FIELDS if field in data.columns}
+    for name in resolve(names):
+        spec = REGISTRY[name]
+        values[name] = spec.compute(*(values[dep] for dep in spec.deps))
+    return data.assign(**{name: values[name] for name in names})
+
+
+# Moving averages
+
+for _window in (20, 50, 200):
+    register(f"SMA_{_window}", "Close")(lambda close, w=_window: close.rolling(window=w).mean())
+
+for _span in (12, 26, 50):
+    register(f"EMA_{_span}", "Close")(lambda close, s=_span: close.ewm(span=s).mean())
+
+
+# RSI
+
+@register("_delta", "Close", public=False)
+def _delta(close):
+    return close.diff()
+
+
+@register("_avg_gain", "_delta", public=False)
+def _avg_gain(delta):
+    return delta.where(delta > 0, 0).rolling(window=14).mean()
+
+
+@register("_avg_loss", "_delta", public=False)
+def _avg_loss(delta):
+    return (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+
+
+@register("RSI", "_avg_gain", "_avg_loss")
+def _rsi(gain, loss):
+    return 100 - (100 / (1 + gain / loss))
+
+
+# MACD
+
+@register("MACD", "EMA_12", "EMA_26")
+def _macd(ema_12, ema_26):
+    return ema_12 - ema_26
+
+
+@register("MACD_Signal", "MACD")
+def _macd_signal(macd):
+    return macd.ewm(span=9).mean()
+
+
+@register("MACD_Histogram", "MACD", "MACD_Signal")
+def _macd_histogram(macd, signal):
+    return macd - signal
+
+
+# Bollinger Bands
+
+@register("_bb_std", "Close", public=False)
+def _bb_std(close):
+    return close.rolling(window=20).std()
+
+
+@register("BB_Middle", "SMA_20")
+def _bb_middle(sma_20):
+    return sma_20
+
+
+@register("BB_Upper", "BB_Middle", "_bb_std")
+def _bb_upper(middle, std):
+    return middle + (std * 2)
+
+
+@register("BB_Lower", "BB_Middle", "_bb_std")
+def _bb_lower(middle, std):
+    return middle - (std * 2)
+
+
+# Stochastic Oscillator
+
+@register("%K", "High", "Low", "Close")
+def _stoch_k(high, low, close):
+    low_14 = low.rolling(window=14).min()
+    high_14 = high.rolling(window=14).max()
+    return 100 * ((close - low_14) / (high_14 - low_14))
+
+
+@register("%D", "%K")
+def _stoch_d(k):
+    return k.rolling(window=3).mean()
+
+
+# Average True Range
+
+@register("_true_range", "High", "Low", "Close", public=False)
+def _true_range(high, low, close):
+    prev_close = close.shift(1)
+    return pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+
+
+@register("ATR", "_true_range")
+def _atr(true_range):
+    return true_range.rolling(window=14).mean()
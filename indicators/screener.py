@@ -0,0 +1,290 @@
+import csv
+import operator
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from indicators.panel import PANEL_COLUMNS, compute_panel, rolling_mean
+from market_data.bar_store import bar_panels, bar_store
+
+
+# Extra fields the screener offers on top of the panel indicators
+BASE_FIELDS = ("High", "Low", "Close", "Volume")
+DERIVED_FIELDS = ("Volume_SMA", "Volume_Ratio", "Change_%")
+FIELDS = BASE_FIELDS + PANEL_COLUMNS + DERIVED_FIELDS
+
+# Columns of the result table, after Ticker
+RESULT_COLUMNS = ("Close", "Change_%", "RSI", "MACD", "MACD_Signal", "%K", "SMA_50", "SMA_200", "ATR",
+                  "Volume_Ratio")
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_%][A-Za-z0-9_%]*)|(<=|>=|==|!=|<|>|\(|\)|\*|/|\+|-))")
+_COMPARISONS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+                "==": operator.eq, "!=": operator.ne}
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+_FIELD_LOOKUP = {name.lower(): name for name in FIELDS}
+
+
+class ScreenSyntaxError(ValueError):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ScreenSyntaxError(f"Unexpected input at: {text[pos:pos + 15]!r}")
+        number, word, symbol = match.groups()
+        if number is not None:
+            tokens.append(("num", float(number)))
+        elif word is not None:
+            tokens.append(("word", word))
+        else:
+            tokens.append(("op", symbol))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser for screen conditions.
+
+        condition  := clause (("and" | "or") clause)*      ("and" binds tighter)
+        clause     := "not" clause | "(" condition ")" | expr compare expr
+        compare    := < <= > >= == != | crosses above | crosses below
+        expr       := term (("+" | "-") term)*
+        term       := atom (("*" | "/") atom)*
+        atom       := number | field | "(" expr ")" | "-" atom
+
+    Conditions compile to functions of a {field: (2 x ticker) array} window
+    holding the previous and latest bar; they return one bool per ticker.
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.fields = set()
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def is_word(self, *words, offset=0):
+        kind, value = self.peek(offset)
+        return kind == "word" and value.lower() in words
+
+    def expect_op(self, op):
+        if self.take() != ("op", op):
+            raise ScreenSyntaxError(f"Expected {op!r}")
+
+    def parse(self):
+        if not self.tokens:
+            raise ScreenSyntaxError("Empty condition")
+        condition = self.condition()
+        if self.pos != len(self.tokens):
+            raise ScreenSyntaxError(f"Unexpected {self.peek()[1]!r}")
+        return condition
+
+    def condition(self):
+        left = self.conjunction()
+        while self.is_word("or"):
+            self.take()
+            right = self.conjunction()
+            left = (lambda a, b: lambda w: a(w) | b(w))(left, right)
+        return left
+
+    def conjunction(self):
+        left = self.clause()
+        while self.is_word("and"):
+            self.take()
+            right = self.clause()
+            left = (lambda a, b: lambda w: a(w) & b(w))(left, right)
+        return left
+
+    def clause(self):
+        if self.is_word("not"):
+            self.take()
+            inner = self.clause()
+            return lambda w: ~inner(w)
+        if self.peek() == ("op", "(") and self._parenthesised_condition():
+            self.take()
+            inner = self.condition()
+            self.expect_op(")")
+            return inner
+        left = self.expr()
+        kind, value = self.peek()
+        if kind == "op" and value in _COMPARISONS:
+            self.take()
+            right = self.expr()
+            compare = _COMPARISONS[value]
+            return lambda w: compare(left(w)[-1], right(w)[-1])
+        if self.is_word("crosses_above", "crosses_below"):
+            direction = self.take()[1].lower().split("_")[1]
+        elif self.is_word("crosses", "crossing", "crossed") and self.is_word("above", "below", offset=1):
+            self.take()
+            direction = self.take()[1].lower()
+        else:
+            raise ScreenSyntaxError("Expected a comparison such as '<' or 'crosses above'")
+        right = self.expr()
+        # Row 0 of the window is the previous bar, row 1 the latest
+        if direction == "above":
+            return lambda w: (left(w)[0] <= right(w)[0]) & (left(w)[1] > right(w)[1])
+        return lambda w: (left(w)[0] >= right(w)[0]) & (left(w)[1] < right(w)[1])
+
+    def _parenthesised_condition(self):
+        """Whether the "(" at the cursor opens a condition rather than an arithmetic group."""
+        depth = 0
+        for kind, value in self.tokens[self.pos:]:
+            if (kind, value) == ("op", "("):
+                depth += 1
+            elif (kind, value) == ("op", ")"):
+                depth -= 1
+                if depth == 0:
+                    return False
+            elif depth == 1 and (value in _COMPARISONS or (kind == "word" and value.lower() in
+                                 ("and", "or", "not", "crosses", "crossing", "crossed",
+                                  "crosses_above", "crosses_below"))):
+                return True
+        return False
+
+    def expr(self):
+        left = self.term()
+        while self.peek()[0] == "op" and self.peek()[1] in ("+", "-"):
+            fn = _ARITHMETIC[self.take()[1]]
+            right = self.term()
+            left = (lambda f, a, b: lambda w: f(a(w), b(w)))(fn, left, right)
+        return left
+
+    def term(self):
+        left = self.atom()
+        while self.peek()[0] == "op" and self.peek()[1] in ("*", "/"):
+            fn = _ARITHMETIC[self.take()[1]]
+            right = self.atom()
+            left = (lambda f, a, b: lambda w: f(a(w), b(w)))(fn, left, right)
+        return left
+
+    def atom(self):
+        kind, value = self.take()
+        if kind == "num":
+            return lambda w: np.full(2, value)[:, None]
+        if (kind, value) == ("op", "-"):
+            inner = self.atom()
+            return lambda w: -inner(w)
+        if (kind, value) == ("op", "("):
+            inner = self.expr()
+            self.expect_op(")")
+            return inner
+        if kind == "word" and value.lower() in _FIELD_LOOKUP:
+            field = _FIELD_LOOKUP[value.lower()]
+            self.fields.add(field)
+            return lambda w: w[field]
+        raise ScreenSyntaxError(f"Unknown field {value!r}" if kind == "word" else "Expected a field or number")
+
+
+def parse_condition(text):
+    """
+    Compile a screen such as "RSI < 30 and MACD crosses above MACD_Signal".
+
+    Returns (predicate, fields used). Field names are case-insensitive;
+    see FIELDS for what is available.
+    """
+    parser = _Parser(text)
+    return parser.parse(), parser.fields
+
+
+def _screen_chunk(condition, tickers, high, low, close, volume):
+    """Evaluate `condition` for one chunk of tickers; runs in a worker process."""
+    predicate, _ = parse_condition(condition)
+    panel = compute_panel(high, low, close)
+    window = {name: panel.cube[k, -2:].astype("float64") for k, name in enumerate(panel.names)}
+    for name, values in zip(BASE_FIELDS, (high, low, close, volume)):
+        window[name] = values[-2:]
+
+    volume_sma = rolling_mean(volume, 20)[-2:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        window["Volume_SMA"] = volume_sma
+        window["Volume_Ratio"] = np.where(volume_sma > 0, volume[-2:] / volume_sma, 0.0)
+        change = np.full((2, close.shape[1]), np.nan)
+        tail = close[-3:]
+        change[-(len(tail) - 1):] = (tail[1:] / tail[:-1] - 1) * 100
+        window["Change_%"] = change
+        matched = np.broadcast_to(predicate(window), (close.shape[1],))
+
+    table = pd.DataFrame({name: window[name][-1] for name in RESULT_COLUMNS}, index=list(tickers))
+    return table[matched]
+
+
+_SYMBOL = re.compile(r"\^?[A-Z0-9][A-Z0-9.\-=]{0,14}")
+_SYMBOL_HEADERS = ("SYMBOL", "TICKER")
+
+
+def read_symbol_list(text, filename=""):
+    """
+    Parse an uploaded list of symbols.
+
+    A `.csv` file is read as a table: the symbol/ticker column if there is
+    such a header, otherwise the first column, so name or sector columns are
+    never taken for symbols. Anything else is free text: one per line, or
+    comma/whitespace separated, with an optional header.
+    """
+    if filename.lower().endswith(".csv"):
+        rows = [row for row in csv.reader(text.splitlines()) if row]
+        header = [cell.strip().upper() for cell in rows[0]] if rows else []
+        column = next((header.index(name) for name in _SYMBOL_HEADERS if name in header), None)
+        if column is not None:
+            rows = rows[1:]
+        tokens = [row[column or 0] for row in rows if len(row) > (column or 0)]
+    else:
+        tokens = re.split(r"[\s,;]+", text)
+
+    symbols = []
+    for token in tokens:
+        token = token.strip().strip('"').upper()
+        if _SYMBOL.fullmatch(token) and token not in _SYMBOL_HEADERS:
+            symbols.append(token)
+    return list(dict.fromkeys(symbols))
+
+
+def run_screen(condition, tickers, period="1y", store=bar_store, rank_by="Change_%", ascending=False,
+               chunk_size=250, workers=None):
+    """
+    Screen `tickers` and return the matches as a ranked (ticker x RESULT_COLUMNS) table.
+
+    Bars come from the bar store in one batched call. Indicators are
+    evaluated for whole chunks of tickers at a time with the NumPy panel
+    engine; when there is more than one chunk they are spread over a
+    process pool (`workers=0` keeps everything in this process). Raises
+    ScreenSyntaxError for an invalid condition before fetching anything.
+    """
+    parse_condition(condition)
+    frames = store.history_many(tickers, period)
+    panels = bar_panels(frames, ("High", "Low", "Close", "Volume"))
+    high, low, close, volume = (panels[field] for field in ("High", "Low", "Close", "Volume"))
+    if close.empty or len(close) < 2:
+        return pd.DataFrame(columns=list(RESULT_COLUMNS))
+
+    chunks = []
+    for start in range(0, close.shape[1], chunk_size):
+        columns = close.columns[start:start + chunk_size]
+        chunks.append((condition, tuple(columns)) + tuple(
+            panel[columns].to_numpy(dtype="float64") for panel in (high, low, close, volume)
+        ))
+
+    if len(chunks) > 1 and workers != 0:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_screen_chunk, *zip(*chunks)))
+    else:
+        results = [_screen_chunk(*chunk) for chunk in chunks]
+
+    table = pd.concat(results) if results else pd.DataFrame(columns=list(RESULT_COLUMNS))
+    table.index.name = "Ticker"
+    return table.sort_values(rank_by, ascending=ascending).round(2)
@@ -0,0 +1,237 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+
+NAN = float("nan")
+
+# The indicators calculate_technical_indicators produces, minus its scratch columns
+STREAMING_COLUMNS = [
+    "SMA_20", "SMA_50", "SMA_200",
+    "EMA_12", "EMA_26", "EMA_50",
+    "RSI",
+    "MACD", "MACD_Signal", "MACD_Histogram",
+    "BB_Middle", "BB_Upper", "BB_Lower",
+    "%K", "%D",
+    "ATR",
+]
+
+
+class RollingMean:
+    """Mean of the last `window` values from a running sum; NaN until the window is full of numbers."""
+
+    def __init__(self, window):
+        self.window = window
+        self._values = deque()
+        self._sum = 0.0
+        self._nans = 0
+
+    def update(self, x):
+        self._values.append(x)
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if math.isnan(old):
+                self._nans -= 1
+            else:
+                self._sum -= old
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return self._sum / self.window
+
+
+class RollingStd:
+    """
+    Sample standard deviation of the last `window` values, via sliding-window Welford updates.
+
+    NaN until the window is full of numbers, like RollingMean; NaNs are
+    counted rather than folded into the running moments.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._values = deque()
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._nans = 0
+
+    def _add(self, x):
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x):
+        self._count -= 1
+        if not self._count:
+            self._mean = self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (x - self._mean)
+
+    def update(self, x):
+        self._values.append(x)
+        old = self._values.popleft() if len(self._values) > self.window else None
+        if math.isnan(x):
+            self._nans += 1
+        elif old is not None and not math.isnan(old) and self._count == self.window:
+            # Replace in one step, which keeps the full-window updates as accurate as before
+            mean = self._mean + (x - old) / self.window
+            self._m2 += (x - old) * (x - mean + old - self._mean)
+            self._mean = mean
+            old = None
+        else:
+            self._add(x)
+        if old is not None:
+            if math.isnan(old):
+                self._nans -= 1
+            else:
+                self._remove(old)
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / (self.window - 1))
+
+
+class RollingExtreme:
+    """Rolling max (or min) over the last `window` values with a monotonic deque, amortised O(1)."""
+
+    def __init__(self, window, mode="max"):
+        self.window = window
+        self._better = (lambda a, b: a >= b) if mode == "max" else (lambda a, b: a <= b)
+        self._candidates = deque()
+        self._count = 0
+        self._last_nan = None
+
+    def update(self, x):
+        i = self._count
+        self._count += 1
+        if math.isnan(x):
+            self._last_nan = i
+        else:
+            while self._candidates and self._better(x, self._candidates[-1][1]):
+                self._candidates.pop()
+            self._candidates.append((i, x))
+        while self._candidates and self._candidates[0][0] <= i - self.window:
+            self._candidates.popleft()
+        # Like pandas, a window holding a NaN has no extreme; NaNs never become candidates
+        if self._count < self.window or (self._last_nan is not None and self._last_nan > i - self.window):
+            return NAN
+        return self._candidates[0][1]
+
+
+class EWMA:
+    """
+    Recursive exponential moving average matching pandas' `ewm(span=...).mean()`.
+
+    pandas defaults to adjust=True, i.e. a weighted average whose weights are
+    renormalised over the bars seen so far. Tracking the weighted sum and the
+    total weight separately reproduces that exactly, one bar at a time. A NaN
+    bar adds nothing but still decays the weights, as in pandas' default
+    ignore_na=False (and indicators.panel.ewm_mean).
+    """
+
+    def __init__(self, span):
+        self.decay = 1 - 2 / (span + 1)
+        self._num = 0.0
+        self._den = 0.0
+
+    def update(self, x):
+        valid = not math.isnan(x)
+        self._num = (x if valid else 0.0) + self.decay * self._num
+        self._den = valid + self.decay * self._den
+        return self._num / self._den if self._den else NAN
+
+
+def _ratio(num, den):
+    """num / den with NumPy semantics for a zero denominator, as pandas column arithmetic gives."""
+    if den == 0:
+        return NAN if num == 0 or math.isnan(num) else math.copysign(math.inf, num)
+    return num / den
+
+
+class StreamingIndicators:
+    """
+    Stateful version of calculate_technical_indicators that takes one bar at a time.
+
+    Each `update` costs O(1) whatever the length of the history: moving
+    averages use running sums, EMAs are recursive, Bollinger widths use
+    Welford variance and the stochastic range uses monotonic deques. The
+    values match the batch pandas calculation bar for bar. Feed completed
+    bars only; a still-forming bar cannot be taken back out.
+    """
+
+    def __init__(self):
+        self._sma = {n: RollingMean(n) for n in (20, 50, 200)}
+        self._ema = {n: EWMA(n) for n in (12, 26, 50)}
+        self._macd_signal = EWMA(9)
+        self._gain = RollingMean(14)
+        self._loss = RollingMean(14)
+        self._bb_std = RollingStd(20)
+        self._low_14 = RollingExtreme(14, "min")
+        self._high_14 = RollingExtreme(14, "max")
+        self._k_mean = RollingMean(3)
+        self._atr = RollingMean(14)
+        self._prev_close = None
+        self.values = dict.fromkeys(STREAMING_COLUMNS, NAN)
+
+    @classmethod
+    def from_history(cls, data):
+        """Build an engine whose state already reflects every bar in `data`."""
+        engine = cls()
+        engine.run(data)
+        return engine
+
+    def update(self, high, low, close):
+        """Advance by one completed bar and return the latest indicator values."""
+        v = {}
+        for n, sma in self._sma.items():
+            v[f"SMA_{n}"] = sma.update(close)
+        for n, ema in self._ema.items():
+            v[f"EMA_{n}"] = ema.update(close)
+
+        # The first bar has no change; the batch version counts it (and any change from or to a NaN close)
+        # as zero gain and zero loss
+        delta = 0.0 if self._prev_close is None else close - self._prev_close
+        if math.isnan(delta):
+            delta = 0.0
+        gain = self._gain.update(max(delta, 0.0))
+        loss = self._loss.update(max(-delta, 0.0))
+        v["RSI"] = 100 - 100 / (1 + _ratio(gain, loss))
+
+        v["MACD"] = v["EMA_12"] - v["EMA_26"]
+        v["MACD_Signal"] = self._macd_signal.update(v["MACD"])
+        v["MACD_Histogram"] = v["MACD"] - v["MACD_Signal"]
+
+        v["BB_Middle"] = v["SMA_20"]
+        bb_std = self._bb_std.update(close)
+        v["BB_Upper"] = v["BB_Middle"] + bb_std * 2
+        v["BB_Lower"] = v["BB_Middle"] - bb_std * 2
+
+        low_14 = self._low_14.update(low)
+        high_14 = self._high_14.update(high)
+        v["%K"] = 100 * _ratio(close - low_14, high_14 - low_14)
+        v["%D"] = self._k_mean.update(v["%K"])
+
+        true_range = high - low
+        if self._prev_close is not None:
+            true_range = max(true_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        v["ATR"] = self._atr.update(true_range)
+
+        self._prev_close = close
+        self.values = v
+        return v
+
+    def run(self, data):
+        """Feed every bar of `data` through `update` and return the indicators as a frame."""
+        rows = [
+            self.update(high, low, close)
+            for high, low, close in zip(data["High"].to_numpy(float), data["Low"].to_numpy(float),
+                                        data["Close"].to_numpy(float))
+        ]
+        return pd.DataFrame(rows, index=data.index, columns=STREAMING_COLUMNS)
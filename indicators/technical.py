@@ -0,0 +1,11 @@
+from indicators.registry import compute_indicators
+
+
+def calculate_technical_indicators(data, indicators=None):
+    """
+    Calculate technical indicators
+
+    `indicators` names the columns to add (see indicators.registry); by
+    default every indicator is added. Returns a new frame.
+    """
+    return compute_indicators(data, indicators)
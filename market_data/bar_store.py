@@ -0,0 +1,308 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data.providers import get_provider
+
+
+DEFAULT_CACHE_DIR = os.environ.get("SSGPT_CACHE_DIR", os.path.join(".cache", "bars"))
+
+# yfinance period strings that are counted in trading days rather than calendar time
+_TRADING_DAY_PERIODS = {"1d": 1, "5d": 5}
+_CALENDAR_PERIODS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def provider_fetch(ticker, interval, start=None, period=None):
+    """Download bars, either from `start` onwards or for a whole `period`."""
+    return get_provider().history(ticker, period=period, interval=interval, start=start)
+
+
+def provider_download(tickers, interval, start=None, period=None):
+    """Download bars for several tickers in one batched request."""
+    return get_provider().download(tickers, period=period, interval=interval, start=start)
+
+
+def split_download(data, tickers):
+    """Split a (field, ticker) column MultiIndex frame into one bar frame per ticker."""
+    frames = {}
+    if data is None or data.empty:
+        return frames
+    for ticker in tickers:
+        if ticker in data.columns.get_level_values(1):
+            frame = data.xs(ticker, axis=1, level=1).dropna(how="all")
+            if not frame.empty:
+                frames[ticker] = frame
+    return frames
+
+
+def bar_panels(frames, fields=("Close",)):
+    """
+    Align bar columns of several tickers on a shared, tz-naive date index.
+
+    `frames` maps ticker -> bar frame. Returns {field: panel}, where each
+    panel has one column per ticker with data, so panel-wide calculations
+    can run column-wise in one pass. Where a ticker has several bars on one
+    day the last one is kept.
+    """
+    fields = list(fields)
+    columns = []
+    for ticker, frame in frames.items():
+        if frame is None or frame.empty:
+            continue
+        index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        # Truncating the raw datetime64 values is much cheaper than DatetimeIndex.normalize()
+        days = index.values.astype("datetime64[D]")
+        # Column-by-column is several times faster than frame[fields] for small frames
+        values = np.column_stack([frame[field].to_numpy(dtype="float64") for field in fields])
+        if len(days) > 1 and not (days[1:] > days[:-1]).all():
+            _, last = np.unique(days[::-1], return_index=True)
+            keep = len(days) - 1 - last
+            days, values = days[keep], values[keep]
+        columns.append((ticker, days, values))
+    if not columns:
+        return {field: pd.DataFrame() for field in fields}
+
+    # Scatter every ticker into one preallocated array instead of aligning thousands of Series
+    union = np.unique(np.concatenate([days for _, days, _ in columns]))
+    panel = np.full((len(fields), len(union), len(columns)), np.nan)
+    for j, (_, days, values) in enumerate(columns):
+        panel[:, np.searchsorted(union, days), j] = values.T
+    index = pd.DatetimeIndex(union.astype("datetime64[ns]"))
+    tickers = [ticker for ticker, _, _ in columns]
+    return {field: pd.DataFrame(panel[k], index=index, columns=tickers) for k, field in enumerate(fields)}
+
+
+def bar_panel(frames, field="Close"):
+    """Align one bar column of several tickers on a shared date index (see bar_panels)."""
+    return bar_panels(frames, (field,))[field]
+
+
+def period_start(period, now):
+    """
+    Return the earliest timestamp a calendar `period` covers, relative to `now`.
+
+    Returns None for "max" and for trading-day periods ("1d", "5d"), which are
+    resolved by counting bars instead.
+    """
+    if period in _CALENDAR_PERIODS:
+        return (now - _CALENDAR_PERIODS[period]).normalize()
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    return None
+
+
+def slice_period(data, period, now=None):
+    """Slice a cached bar frame down to what yfinance would return for `period`."""
+    if data.empty or period == "max":
+        return data
+    if period in _TRADING_DAY_PERIODS:
+        days = pd.Index(data.index.normalize()).unique()[-_TRADING_DAY_PERIODS[period]:]
+        return data[data.index.normalize() >= days[0]]
+    if now is None:
+        now = pd.Timestamp.now(tz=data.index.tz)
+    start = period_start(period, now)
+    if start is None:
+        raise ValueError(f"Unsupported period: {period}")
+    return data[data.index >= start]
+
+
+class BarStore:
+    """
+    Columnar on-disk cache of OHLCV bars, one Parquet file per ticker/interval.
+
+    The first request for a ticker downloads the requested period. Later
+    requests only fetch bars from the last cached bar onwards (the last bar is
+    re-fetched because it may still be forming), merge them in and slice any
+    `period` locally. Requests for more history than is cached trigger a
+    one-off backfill of the wider period.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, fetch=provider_fetch, download=provider_download,
+                 refresh_interval=60):
+        self.cache_dir = cache_dir
+        self.fetch = fetch
+        self.download = download
+        self.refresh_interval = refresh_interval
+        self._frames = {}
+        self._meta = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _paths(self, ticker, interval):
+        base = os.path.join(self.cache_dir, f"{ticker.upper()}_{interval}")
+        return base + ".parquet", base + ".json"
+
+    def _load(self, key):
+        if key in self._frames:
+            return self._frames[key], self._meta[key]
+        data_path, meta_path = self._paths(*key)
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            try:
+                data = pd.read_parquet(data_path)
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return None, None
+            self._frames[key], self._meta[key] = data, meta
+            return data, meta
+        return None, None
+
+    def _save(self, key, data, meta):
+        self._frames[key], self._meta[key] = data, meta
+        data_path, meta_path = self._paths(*key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data.to_parquet(data_path)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+        except OSError:
+            # The in-memory copy still serves this process if the disk is read-only
+            pass
+
+    def _covers(self, data, meta, period):
+        """Whether the cached bars reach back far enough to serve `period`."""
+        covered = meta.get("covered_from")
+        if covered == "max":
+            return True
+        if period == "max":
+            return False
+        if period in _TRADING_DAY_PERIODS:
+            days = pd.Index(data.index.normalize()).unique()
+            return len(days) >= _TRADING_DAY_PERIODS[period]
+        start = period_start(period, pd.Timestamp.now(tz=data.index.tz))
+        return covered is not None and pd.Timestamp(covered) <= start
+
+    @staticmethod
+    def _merge(cached, fresh):
+        if cached is None or cached.empty:
+            return fresh.sort_index()
+        if fresh is None or fresh.empty:
+            return cached
+        # Batched downloads return tz-naive daily bars while single-ticker history is tz-aware
+        if cached.index.tz is not None and fresh.index.tz is None:
+            fresh = fresh.tz_localize(cached.index.tz)
+        elif cached.index.tz is None and fresh.index.tz is not None:
+            fresh = fresh.tz_localize(None)
+        merged = pd.concat([cached, fresh])
+        return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+    @staticmethod
+    def _covered_from(period, data, fresh):
+        if period == "max":
+            return "max"
+        start = period_start(period, pd.Timestamp.now(tz=data.index.tz))
+        return (start if start is not None else fresh.index[0]).isoformat()
+
+    def _needs(self, key, period, now):
+        """Whether `key` needs a full `period` download ("cold"), a delta ("stale") or nothing."""
+        data, meta = self._load(key)
+        if data is None or data.empty or not self._covers(data, meta, period):
+            return "cold"
+        if now - meta.get("checked_at", 0) >= self.refresh_interval:
+            return "stale"
+        return None
+
+    def history(self, ticker, period="1y", interval="1d"):
+        """Return bars for `ticker` covering `period`, fetching only what is missing."""
+        key = (ticker.upper(), interval)
+        with self._lock(key):
+            now = time.time()
+            needs = self._needs(key, period, now)
+            data, meta = self._load(key)
+
+            if needs == "cold":
+                fresh = self.fetch(ticker, interval, period=period)
+                if fresh is None or fresh.empty:
+                    return fresh if data is None else slice_period(data, period).copy()
+                data = self._merge(data, fresh)
+                meta = {"covered_from": self._covered_from(period, data, fresh), "checked_at": now}
+                self._save(key, data, meta)
+            elif needs == "stale":
+                last_bar = data.index[-1]
+                try:
+                    fresh = self.fetch(ticker, interval, start=last_bar.strftime("%Y-%m-%d"))
+                except Exception:
+                    # The cached bars are still good; leave checked_at alone so the next call retries
+                    return slice_period(data, period).copy()
+                data = self._merge(data, fresh)
+                meta = dict(meta, checked_at=now)
+                self._save(key, data, meta)
+
+            # Callers add indicator columns in place, so never hand out the cached frame
+            return slice_period(data, period).copy()
+
+    def _ingest(self, frames, tickers, interval, period, now):
+        """Merge batched download results into the per-ticker caches."""
+        for ticker in tickers:
+            key = (ticker, interval)
+            with self._lock(key):
+                data, meta = self._load(key)
+                fresh = frames.get(ticker)
+                if fresh is None:
+                    continue
+                data = self._merge(data, fresh)
+                if period is not None:
+                    meta = {"covered_from": self._covered_from(period, data, fresh), "checked_at": now}
+                else:
+                    meta = dict(meta, checked_at=now)
+                self._save(key, data, meta)
+
+    def history_many(self, tickers, period="1y", interval="1d"):
+        """
+        Return {ticker: bars} for several tickers using at most two batched downloads.
+
+        Tickers with no usable cache are downloaded together for the whole
+        `period`; tickers whose cache is due for a refresh are topped up
+        together from the oldest of their last bars. Duplicates are dropped,
+        and tickers the upstream has no data for map to an empty frame.
+        """
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t))
+        now = time.time()
+        needs = {t: self._needs((t, interval), period, now) for t in tickers}
+        cold = [t for t in tickers if needs[t] == "cold"]
+        stale = [t for t in tickers if needs[t] == "stale"]
+
+        if cold:
+            frames = split_download(self.download(cold, interval, period=period), cold)
+            self._ingest(frames, cold, interval, period, now)
+        if stale:
+            start = min(self._frames[(t, interval)].index[-1].tz_localize(None) for t in stale)
+            try:
+                frames = split_download(self.download(stale, interval, start=start.strftime("%Y-%m-%d")), stale)
+            except Exception:
+                # As in history(): serve the cached bars and retry the top-up next time
+                frames = {}
+            self._ingest(frames, stale, interval, None, now)
+
+        result = {}
+        for ticker in tickers:
+            data = self._frames.get((ticker, interval))
+            result[ticker] = slice_period(data, period).copy() if data is not None else pd.DataFrame()
+        return result
+
+    def invalidate(self, ticker=None, interval=None):
+        """Force the next request to re-check upstream for new bars."""
+        # Other sessions may be saving new keys meanwhile, so iterate over a snapshot
+        for key, meta in list(self._meta.items()):
+            if (ticker is None or key[0] == ticker.upper()) and (interval is None or key[1] == interval):
+                meta["checked_at"] = 0
+
+
+# Shared across Streamlit sessions, since module globals live for the whole server process
+bar_store = BarStore()
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+
+from market_data.singleflight import market_flight
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire `ttl` seconds after they are stored.
+
+    Expired entries are dropped when read and swept whenever the cache
+    outgrows `maxsize`; if it is still full, the oldest-stored entries go.
+    """
+
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return default
+        return entry[1]
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            # Re-inserting keeps the entries in storage order, oldest first
+            self._entries.pop(key, None)
+            self._entries[key] = (now, value)
+            if len(self._entries) > self.maxsize:
+                for k in [k for k, (stored, _) in self._entries.items() if now - stored >= self.ttl]:
+                    del self._entries[k]
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def missing(self, keys):
+        """Return the keys that are absent or expired, in the order given."""
+        now = time.monotonic()
+        with self._lock:
+            return [k for k in keys if k not in self._entries or now - self._entries[k][0] >= self.ttl]
+
+    def discard(self, predicate):
+        """Drop every entry whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# How long each class of data stays fresh, in seconds
+DEFAULT_TTLS = {
+    "quote": 15,
+    "intraday": 60,
+    "news": 15 * 60,
+    "info": 6 * 3600,
+    "search": 24 * 3600,
+    "statement": 3 * 24 * 3600,
+}
+
+_MISSING = object()
+
+
+class MarketDataCache:
+    """
+    Market data cache with a separate TTL class per kind of data.
+
+    Fast-moving data (quotes, intraday bars) expires in seconds while company
+    info and financial statements live for hours or days. Entries are keyed by
+    (ticker, params) within their class, so a refresh can invalidate just one
+    ticker and/or one class instead of wiping everything. Misses go through
+    the single-flight layer, so concurrent sessions share one upstream call.
+    """
+
+    def __init__(self, ttls=None, flight=market_flight):
+        self.flight = flight
+        self._classes = {kind: TTLCache(ttl) for kind, ttl in (ttls or DEFAULT_TTLS).items()}
+
+    def ttl_class(self, kind):
+        """The underlying TTLCache for `kind`, keyed by (ticker, params)."""
+        return self._classes[kind]
+
+    def fetch(self, kind, ticker, fetch, params=()):
+        """Return the cached value for `ticker` (or search query) in class `kind`, calling `fetch` on a miss."""
+        cache = self._classes[kind]
+        value = cache.get((ticker, params), _MISSING)
+        if value is _MISSING:
+            value = self.flight.do((ticker, kind, params), fetch)
+            cache.set((ticker, params), value)
+        return value
+
+    def invalidate(self, ticker=None, kind=None):
+        """Drop cached entries for one ticker and/or one class; with no arguments drop everything."""
+        kinds = [kind] if kind is not None else list(self._classes)
+        for k in kinds:
+            self._classes[k].discard(lambda key: ticker is None or key[0] == ticker)
+
+
+market_cache = MarketDataCache()
@@ -0,0 +1,123 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from market_data.bar_store import bar_panel, bar_store
+from market_data.symbols import get_symbol_index
+
+
+# Return horizons in trading days; "ytd" is measured from the last close of the previous year
+HORIZONS = {"1D": 1, "1W": 5, "1M": 21, "3M": 63, "YTD": "ytd"}
+
+# Bars averaged to size each tile by dollar volume
+WEIGHT_WINDOW = 20
+
+
+def horizon_returns(closes, horizons=HORIZONS):
+    """
+    Return a (ticker x horizon) frame of percentage returns from a close panel.
+
+    `closes` has one column per ticker on a shared date index. Every horizon
+    and every ticker is computed in a single NumPy broadcast: the last row
+    divided by the rows `horizon` bars earlier. Horizons longer than the
+    panel come out as NaN.
+    """
+    columns = list(horizons)
+    if closes.empty:
+        return pd.DataFrame(index=closes.columns, columns=columns, dtype=float)
+    closes = closes.sort_index().ffill()
+    values = closes.to_numpy(dtype=float)
+    last = len(values) - 1
+
+    positions = []
+    for horizon in horizons.values():
+        if horizon == "ytd":
+            year_start = pd.Timestamp(closes.index[-1].year, 1, 1)
+            positions.append(max(closes.index.searchsorted(year_start) - 1, 0))
+        else:
+            positions.append(last - horizon)
+    positions = np.asarray(positions)
+
+    base = np.full((len(positions), values.shape[1]), np.nan)
+    valid = positions >= 0
+    base[valid] = values[positions[valid]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (values[last] / base - 1) * 100
+    return pd.DataFrame(returns.T, index=closes.columns, columns=columns)
+
+
+def sector_summary(table, horizons=HORIZONS):
+    """Aggregate a heatmap table to dollar-volume-weighted returns per sector."""
+    columns = list(horizons)
+    weights = table["Weight"]
+    weighted = table[columns].mul(weights, axis=0)
+    # Ignore tickers with no return for a horizon instead of letting them drag the sector to zero
+    present = table[columns].notna().mul(weights, axis=0)
+    grouped = weighted.groupby(table["Sector"]).sum() / present.groupby(table["Sector"]).sum()
+    grouped.insert(0, "Stocks", table.groupby("Sector").size())
+    return grouped.sort_values("Stocks", ascending=False).round(2)
+
+
+class HeatmapEngine:
+    """
+    Multi-horizon returns for a whole ticker universe, served from the bar store.
+
+    Bars come from one batched `history_many` call, so a warm universe costs
+    at most a single delta download. The returns table is memoised against
+    the last bar of every ticker and only recomputed when new bars arrive.
+    """
+
+    def __init__(self, store=bar_store, symbol_index=None, horizons=HORIZONS, period="1y"):
+        self.store = store
+        self._symbol_index = symbol_index
+        self.horizons = horizons
+        self.period = period
+        self.computations = 0
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    @property
+    def symbol_index(self):
+        if self._symbol_index is None:
+            self._symbol_index = get_symbol_index()
+        return self._symbol_index
+
+    def universe(self):
+        """Every stock with a known sector in the symbol index, excluding ETFs."""
+        return sorted(s for s, sector in self.symbol_index.sectors().items() if sector != "ETF")
+
+    def compute(self, tickers=None):
+        """
+        Return a frame indexed by ticker with Sector, Weight and one return column per horizon.
+
+        Weight is the average dollar volume over the last WEIGHT_WINDOW bars.
+        Tickers without data are left out.
+        """
+        tickers = tuple(dict.fromkeys(t.upper() for t in (tickers or self.universe())))
+        frames = self.store.history_many(tickers, self.period)
+        signature = tuple(
+            (t, f.index[-1], float(f["Close"].iloc[-1])) if not f.empty else (t, None, None)
+            for t, f in frames.items()
+        )
+        with self._lock:
+            memo = self._memo.get(tickers)
+            if memo is not None and memo[0] == signature:
+                return memo[1]
+
+        closes = bar_panel(frames)
+        volumes = bar_panel(frames, field="Volume")
+        table = horizon_returns(closes, self.horizons)
+        dollar_volume = (closes * volumes).tail(WEIGHT_WINDOW).mean()
+        table.insert(0, "Weight", dollar_volume.reindex(table.index).fillna(0).clip(lower=1))
+        sectors = {t: self.symbol_index.sector(t) or "Other" for t in table.index}
+        table.insert(0, "Sector", pd.Series(sectors))
+
+        with self._lock:
+            self.computations += 1
+            self._memo[tickers] = (signature, table)
+        return table
+
+
+# Shared across sessions so one computation serves every viewer of the same universe
+heatmap_engine = HeatmapEngine()
@@ -0,0 +1,127 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allow `rate` calls per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost=1):
+        """
+        Block until `cost` tokens are available and take them. Returns the seconds spent waiting.
+
+        A cost above `capacity` (e.g. a batch download charged per ticker)
+        is taken in capacity-sized pieces, so it still pays the full cost.
+        """
+        waited = 0.0
+        while cost > self.capacity:
+            waited += self._take(self.capacity)
+            cost -= self.capacity
+        return waited + self._take(cost)
+
+    def _take(self, cost):
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                delay = (cost - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class UpstreamClient:
+    """
+    Shared gateway for every upstream call the apps make.
+
+    Direct HTTP requests go through one pooled keep-alive `requests.Session`.
+    Both those requests and library calls such as yfinance's draw from a
+    single token bucket. Rate-limited or failed calls (HTTP 429/5xx, or an
+    exception listed in `retry_on`) are retried with full-jitter exponential
+    backoff, honouring Retry-After when the server sends it.
+    """
+
+    def __init__(self, rate=5.0, burst=10, max_retries=4, backoff_base=0.5, backoff_max=8.0, pool_size=20):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._metrics = {"calls": 0, "retries": 0, "throttled": 0, "wait_total": 0.0, "wait_max": 0.0}
+
+    def _record(self, waited):
+        with self._lock:
+            self._metrics["calls"] += 1
+            self._metrics["wait_total"] += waited
+            self._metrics["wait_max"] = max(self._metrics["wait_max"], waited)
+
+    def _backoff(self, attempt, retry_after=None):
+        with self._lock:
+            self._metrics["retries"] += 1
+        if retry_after is not None:
+            delay = min(self.backoff_max, retry_after)
+        else:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        """GET `url` through the pooled session, retrying throttled and server-error responses."""
+        for attempt in range(self.max_retries + 1):
+            self._record(self.bucket.acquire())
+            resp = self.session.get(url, **kwargs)
+            if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return resp
+            if resp.status_code == 429:
+                with self._lock:
+                    self._metrics["throttled"] += 1
+            retry_after = resp.headers.get("Retry-After")
+            self._backoff(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None)
+        return resp
+
+    def call(self, fn, cost=1, retry_on=()):
+        """Run a library call such as a yfinance download under the shared rate budget."""
+        for attempt in range(self.max_retries + 1):
+            self._record(self.bucket.acquire(cost))
+            try:
+                return fn()
+            except retry_on:
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    self._metrics["throttled"] += 1
+                self._backoff(attempt)
+
+    def metrics(self):
+        """Return call, retry and throttle counts plus queue wait statistics in seconds."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["wait_avg"] = metrics["wait_total"] / metrics["calls"] if metrics["calls"] else 0.0
+        return metrics
+
+
+upstream = UpstreamClient(
+    rate=float(os.environ.get("SSGPT_UPSTREAM_RATE", 5)),
+    burst=int(os.environ.get("SSGPT_UPSTREAM_BURST", 10)),
+)
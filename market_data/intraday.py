@@ -0,0 +1,162 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data.cache import DEFAULT_TTLS
+from market_data.providers import get_provider
+
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def provider_intraday(ticker, interval, start=None):
+    """Download today's intraday bars, or only those from `start` onwards."""
+    return get_provider().intraday(ticker, interval=interval, start=start)
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity ring buffer of OHLCV bars backed by NumPy arrays.
+
+    Appending is O(new bars): once full, the oldest bars are overwritten in
+    place instead of reallocating. A bar with the same timestamp as the
+    newest one replaces it, since the latest bar keeps changing until its
+    minute closes.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.tz = None
+        self._times = np.empty(capacity, dtype="int64")
+        self._values = np.empty((capacity, len(BAR_COLUMNS)), dtype="float64")
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    @property
+    def last_time(self):
+        """Timestamp of the newest bar, or None when empty."""
+        if not self._size:
+            return None
+        ns = self._times[(self._start + self._size - 1) % self.capacity]
+        return self._to_index(np.array([ns]))[0]
+
+    def _to_index(self, times):
+        index = pd.to_datetime(times, unit="ns", utc=self.tz is not None)
+        return index.tz_convert(self.tz) if self.tz is not None else index
+
+    def extend(self, bars):
+        """Add `bars` newer than (or equal to) the newest held bar. Returns how many rows were written."""
+        if bars is None or bars.empty:
+            return 0
+        index = pd.DatetimeIndex(bars.index)
+        if not self._size:
+            self.tz = index.tz
+        elif index.tz is not None and self.tz is not None:
+            index = index.tz_convert(self.tz)
+        times = index.as_unit("ns").asi8
+        values = bars[BAR_COLUMNS].to_numpy(dtype="float64")
+
+        if self._size:
+            newest = self._times[(self._start + self._size - 1) % self.capacity]
+            keep = times >= newest
+            times, values = times[keep], values[keep]
+            if len(times) and times[0] == newest:
+                # Overwrite the still-forming last bar
+                self._values[(self._start + self._size - 1) % self.capacity] = values[0]
+                written = 1
+                times, values = times[1:], values[1:]
+            else:
+                written = 0
+        else:
+            written = 0
+
+        if len(times) > self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+        n = len(times)
+        if n:
+            slots = (self._start + self._size + np.arange(n)) % self.capacity
+            self._times[slots] = times
+            self._values[slots] = values
+            overflow = max(0, self._size + n - self.capacity)
+            self._start = (self._start + overflow) % self.capacity
+            self._size = min(self.capacity, self._size + n)
+        return written + n
+
+    def to_frame(self):
+        """Return the held bars, oldest first, as a new DataFrame."""
+        slots = (self._start + np.arange(self._size)) % self.capacity
+        return pd.DataFrame(self._values[slots], index=self._to_index(self._times[slots]), columns=BAR_COLUMNS)
+
+
+class IntradayStream:
+    """
+    Per-ticker intraday bars kept in memory and topped up incrementally.
+
+    The first request for a ticker downloads the whole session. After
+    `refresh_interval` seconds the next request only fetches bars from the
+    newest held bar onwards and appends them to the ticker's ring buffer,
+    so a refresh costs time proportional to the new bars. When a new
+    trading day starts the buffer is reset to that day's bars.
+    """
+
+    def __init__(self, fetch=provider_intraday, interval="1m", capacity=1024,
+                 refresh_interval=DEFAULT_TTLS["intraday"]):
+        self.fetch = fetch
+        self.interval = interval
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self._buffers = {}
+        self._checked_at = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _refresh(self, ticker, buffer):
+        if not len(buffer):
+            buffer.extend(self.fetch(ticker, self.interval))
+            return
+        fresh = self.fetch(ticker, self.interval, start=buffer.last_time)
+        if fresh is None or fresh.empty:
+            return
+        session = fresh.index[-1].normalize()
+        if session != buffer.last_time.normalize():
+            buffer.clear()
+            fresh = fresh[fresh.index.normalize() == session]
+        buffer.extend(fresh)
+
+    def get(self, ticker):
+        """Return today's bars for `ticker`, fetching only those not already held."""
+        ticker = ticker.upper()
+        with self._lock(ticker):
+            buffer = self._buffers.get(ticker)
+            if buffer is None:
+                buffer = self._buffers[ticker] = BarRingBuffer(self.capacity)
+            now = time.monotonic()
+            checked = self._checked_at.get(ticker)
+            if checked is None or now - checked >= self.refresh_interval:
+                self._refresh(ticker, buffer)
+                self._checked_at[ticker] = now
+            return buffer.to_frame()
+
+    def invalidate(self, ticker=None):
+        """Make the next request for `ticker` (or every ticker) check upstream for new bars."""
+        with self._locks_guard:
+            for key in list(self._checked_at):
+                if ticker is None or key == ticker.upper():
+                    del self._checked_at[key]
+
+
+# Shared across Streamlit sessions, so every viewer of a ticker draws from one buffer
+intraday_stream = IntradayStream()
@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
+
+import pandas as pd
+
+from market_data.snapshot import TickerSnapshot
+
+
+@dataclass(frozen=True)
+class DashboardData:
+    """
+    Everything one dashboard render needs, fetched up front.
+
+    The bundle and its TickerSnapshot are frozen and its mappings are
+    read-only. The DataFrames are
+    shared with the caches they came from, so callers must `.copy()` a frame
+    before adding columns to it.
+    """
+    ticker: str
+    period: str
+    history: pd.DataFrame
+    prediction_history: pd.DataFrame
+    snapshot: TickerSnapshot
+    news: Tuple[Any, ...]
+    errors: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    timings: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+
+_DEFAULTS = {
+    "history": pd.DataFrame,
+    "prediction_history": pd.DataFrame,
+    "news": list,
+}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def prefetch_dashboard(ticker, period, fetchers, initializer=None):
+    """
+    Run the independent dashboard fetches concurrently and bundle the results.
+
+    Parameters
+    ----------
+    ticker : str
+        Symbol being rendered.
+    period : str
+        yfinance period string for the historical chart.
+    fetchers : dict
+        Maps each DashboardData field ("history", "prediction_history",
+        "snapshot", "news") to a zero-argument callable. Any other name
+        (e.g. "intraday") is a warm-up: it runs alongside the rest to fill
+        a cache that something else reads later, and its result is dropped.
+    initializer : callable, optional
+        Run in each worker thread before it fetches anything, e.g. to attach
+        the Streamlit script context.
+
+    Returns
+    -------
+    DashboardData
+        A failed fetch leaves an empty value in its field and its error
+        message in `errors`, so one bad endpoint doesn't sink the render.
+    """
+    results, errors, timings = {}, {}, {}
+    with ThreadPoolExecutor(max_workers=len(fetchers), initializer=initializer) as pool:
+        futures = {name: pool.submit(_timed, fn) for name, fn in fetchers.items()}
+        for name, future in futures.items():
+            try:
+                results[name], timings[name] = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+
+    values = {}
+    for name, default in _DEFAULTS.items():
+        value = results.get(name)
+        values[name] = default() if value is None else value
+
+    return DashboardData(
+        ticker=ticker,
+        period=period,
+        history=values["history"],
+        prediction_history=values["prediction_history"],
+        snapshot=results.get("snapshot") or TickerSnapshot(symbol=ticker),
+        news=tuple(values["news"]),
+        errors=MappingProxyType(errors),
+        timings=MappingProxyType(timings),
+    )
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import pickle
+import random
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+from market_data.http import upstream
+
+
+class MarketDataProvider:
+    """
+    Interface for every market data backend used by the apps.
+
+    History-like methods return DataFrames shaped like yfinance's, indexed by
+    timestamp with Open/High/Low/Close/Volume columns. `download` returns
+    the (field, ticker) MultiIndex columns of `yf.download`.
+    """
+
+    def history(self, ticker, period=None, interval="1d", start=None):
+        raise NotImplementedError
+
+    def intraday(self, ticker, interval="1m", start=None):
+        """Today's intraday bars, or only those from `start` onwards."""
+        if start is not None:
+            return self.history(ticker, interval=interval, start=start)
+        return self.history(ticker, period="1d", interval=interval)
+
+    def info(self, ticker):
+        raise NotImplementedError
+
+    def news(self, ticker):
+        raise NotImplementedError
+
+    def statement(self, ticker, kind):
+        """One of the "balance_sheet", "financials" or "cashflow" statements."""
+        raise NotImplementedError
+
+    def download(self, tickers, period=None, interval="1d", start=None, auto_adjust=True):
+        raise NotImplementedError
+
+    def search(self, query, max_results=5):
+        """Return (symbol, name, exchange) tuples of equities and ETFs matching `query`."""
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live data from Yahoo Finance through yfinance.
+
+    Every call is made through `client`, so all sessions share one upstream
+    rate budget and back off together when Yahoo starts throttling.
+    """
+
+    SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+
+    def __init__(self, client=upstream):
+        self.client = client
+
+    def _call(self, fn, cost=1):
+        return self.client.call(fn, cost=cost, retry_on=(YFRateLimitError,))
+
+    def history(self, ticker, period=None, interval="1d", start=None):
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return self._call(lambda: stock.history(start=start, interval=interval))
+        return self._call(lambda: stock.history(period=period or "1mo", interval=interval))
+
+    def info(self, ticker):
+        return self._call(lambda: yf.Ticker(ticker).info)
+
+    def news(self, ticker):
+        return self._call(lambda: yf.Ticker(ticker).news)
+
+    def statement(self, ticker, kind):
+        if kind not in ("balance_sheet", "financials", "cashflow"):
+            raise ValueError(f"Unknown statement: {kind}")
+        return self._call(lambda: getattr(yf.Ticker(ticker), kind))
+
+    def download(self, tickers, period=None, interval="1d", start=None, auto_adjust=True):
+        tickers = list(tickers)
+        kwargs = {"start": start} if start is not None else {"period": period or "1mo"}
+        # yfinance issues one request per ticker, so charge the budget accordingly
+        return self._call(lambda: yf.download(
+            tickers, interval=interval, auto_adjust=auto_adjust,
+            group_by="column", progress=False, threads=True, **kwargs,
+        ), cost=len(tickers))
+
+    def search(self, query, max_results=5):
+        resp = self.client.get(
+            self.SEARCH_URL,
+            params={"q": query, "quotesCount": max_results, "newsCount": 0, "lang": "en"},
+            timeout=2,
+        )
+        if resp.status_code != 200:
+            return []
+        suggestions = []
+        for item in resp.json().get("quotes", []):
+            # Filter out cryptocurrencies and funds for relevance
+            if item.get("quoteType") in ("EQUITY", "ETF"):
+                name = item.get("shortname") or item.get("longname") or ""
+                suggestions.append((item.get("symbol"), name, item.get("exchange", "")))
+        return suggestions[:max_results]
+
+
+class RecordingNotFound(LookupError):
+    pass
+
+
+class RecordReplayProvider(MarketDataProvider):
+    """
+    Capture responses to local files and serve them back offline.
+
+    In "record" mode every call goes to `upstream` and its result is pickled
+    under `directory`, keyed by method and arguments. In "replay" mode the
+    recordings are served without touching the network, after sleeping
+    `latency` seconds (plus up to `jitter` seconds, from a seeded RNG) to
+    simulate upstream round-trips deterministically.
+
+    Incremental fetches (`start=...`) that were never recorded replay as "no
+    new bars", so caches layered on top behave as if the market were closed.
+    """
+
+    def __init__(self, directory, mode="replay", upstream=None, latency=0.0, jitter=0.0, seed=0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode == "record" and upstream is None:
+            upstream = YFinanceProvider()
+        self.directory = directory
+        self.mode = mode
+        self.upstream = upstream
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _path(self, method, args):
+        key = json.dumps([method, args], sort_keys=True, default=str)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, method, f"{digest}.pkl"), key
+
+    def _call(self, method, empty=None, **args):
+        path, key = self._path(method, args)
+        if self.mode == "record":
+            value = getattr(self.upstream, method)(**args)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                pickle.dump({"key": key, "value": value}, f)
+            return value
+
+        if self.latency or self.jitter:
+            with self._rng_lock:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            time.sleep(delay)
+        if not os.path.exists(path):
+            if empty is not None and args.get("start") is not None:
+                return empty()
+            raise RecordingNotFound(f"No recording for {key}")
+        with open(path, "rb") as f:
+            return pickle.load(f)["value"]
+
+    def history(self, ticker, period=None, interval="1d", start=None):
+        return self._call("history", pd.DataFrame, ticker=ticker, period=period, interval=interval, start=start)
+
+    def intraday(self, ticker, interval="1m", start=None):
+        return self._call("intraday", pd.DataFrame, ticker=ticker, interval=interval, start=start)
+
+    def info(self, ticker):
+        return self._call("info", ticker=ticker)
+
+    def news(self, ticker):
+        return self._call("news", ticker=ticker)
+
+    def statement(self, ticker, kind):
+        return self._call("statement", ticker=ticker, kind=kind)
+
+    def download(self, tickers, period=None, interval="1d", start=None, auto_adjust=True):
+        return self._call("download", pd.DataFrame, tickers=list(tickers), period=period,
+                          interval=interval, start=start, auto_adjust=auto_adjust)
+
+    def search(self, query, max_results=5):
+        return self._call("search", query=query, max_results=max_results)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def provider_from_env():
+    """
+    Build the provider selected by environment variables.
+
+    SSGPT_DATA_PROVIDER    "yfinance" (default), "record" or "replay"
+    SSGPT_RECORDINGS_DIR   where recordings live (default "recordings")
+    SSGPT_REPLAY_LATENCY   seconds of injected latency per replayed call
+    SSGPT_REPLAY_JITTER    extra random latency, up to this many seconds
+    """
+    kind = os.environ.get("SSGPT_DATA_PROVIDER", "yfinance").lower()
+    if kind == "yfinance":
+        return YFinanceProvider()
+    return RecordReplayProvider(
+        os.environ.get("SSGPT_RECORDINGS_DIR", "recordings"),
+        mode=kind,
+        latency=float(os.environ.get("SSGPT_REPLAY_LATENCY", 0)),
+        jitter=float(os.environ.get("SSGPT_REPLAY_JITTER", 0)),
+    )
+
+
+def get_provider():
+    """Return the process-wide market data provider."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = provider_from_env()
+        return _provider
+
+
+def set_provider(provider):
+    """Replace the process-wide provider, e.g. with a replay backend for benchmarks."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from market_data.cache import market_cache
+from market_data.providers import get_provider
+
+
+def download_closes(tickers):
+    """Download the last few daily closes for all `tickers` in one request."""
+    data = get_provider().download(tickers, period="5d", interval="1d", auto_adjust=False)
+    if data is None or data.empty:
+        return pd.DataFrame()
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+    return closes
+
+
+def quote_from_closes(closes):
+    """Build a quote dict (price, prev, daychg, pctchg) from one ticker's recent closes."""
+    closes = closes.dropna()
+    price = float(closes.iloc[-1]) if len(closes) else None
+    prev = float(closes.iloc[-2]) if len(closes) > 1 else None
+    daychg = pctchg = None
+    if price is not None and prev:
+        daychg = price - prev
+        pctchg = (daychg / prev) * 100
+    return {"price": price, "daychg": daychg, "pctchg": pctchg}
+
+
+class QuoteCache:
+    """
+    Batched quote lookups for a list of tickers.
+
+    Tickers whose quote is missing or older than the "quote" TTL class are
+    fetched together in a single vectorized download, so the cost of a
+    refresh does not grow with one round-trip per ticker.
+    """
+
+    def __init__(self, download=download_closes, cache=market_cache):
+        self.download = download
+        self._cache = cache.ttl_class("quote")
+
+    def get_quotes(self, tickers):
+        tickers = [t.upper().strip() for t in tickers]
+        stale = [t for t, _ in self._cache.missing([(t, ()) for t in tickers])]
+        if stale:
+            try:
+                closes = self.download(stale)
+            except Exception:
+                closes = pd.DataFrame()
+            for ticker in stale:
+                if ticker in closes.columns:
+                    self._cache.set((ticker, ()), quote_from_closes(closes[ticker]))
+                else:
+                    self._cache.set((ticker, ()), {"price": None, "daychg": None, "pctchg": None})
+        return {t: self._cache.get((t, ())) for t in tickers}
+
+
+quote_cache = QuoteCache()
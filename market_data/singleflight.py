@@ -0,0 +1,62 @@
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent fetches of the same resource into one upstream call.
+
+    The first caller for a key runs the fetch; callers that arrive while it is
+    still in flight block until it finishes and receive the same result (or
+    the same exception). Keys are typically (ticker, endpoint, params) tuples.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._fetches = 0
+        self._shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._fetches += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Return upstream fetches made, duplicate fetches saved and fetches currently in flight."""
+        with self._lock:
+            return {"fetches": self._fetches, "shared": self._shared, "in_flight": len(self._calls)}
+
+
+# Process-wide, so concurrent Streamlit sessions share in-flight requests
+market_flight = SingleFlight()
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+
+# Snapshot field -> key in the yfinance `info` dict
+_INFO_KEYS = {
+    "long_name": "longName",
+    "sector": "sector",
+    "industry": "industry",
+    "previous_close": "regularMarketPreviousClose",
+    "average_volume": "averageVolume",
+    "market_cap": "marketCap",
+    "trailing_pe": "trailingPE",
+    "total_revenue": "totalRevenue",
+    "dividend_yield": "dividendYield",
+    "return_on_equity": "returnOnEquity",
+    "profit_margins": "profitMargins",
+    "debt_to_equity": "debtToEquity",
+    "beta": "beta",
+    "business_summary": "longBusinessSummary",
+    "full_time_employees": "fullTimeEmployees",
+    "start_date": "startDate",
+    "website": "website",
+    "country": "country",
+    "currency": "currency",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TickerSnapshot:
+    """
+    Immutable projection of the company info fields the dashboard displays.
+
+    Built once per ticker from a single `info` lookup and shared by every
+    section of a render. Missing fields are None. The full info dict is
+    dropped after projection, so caching a snapshot costs a few hundred
+    bytes instead of a large nested dict.
+    """
+    symbol: str
+    long_name: Optional[str] = None
+    sector: Optional[str] = None
+    industry: Optional[str] = None
+    previous_close: Optional[float] = None
+    average_volume: Optional[int] = None
+    market_cap: Optional[float] = None
+    trailing_pe: Optional[float] = None
+    total_revenue: Optional[float] = None
+    dividend_yield: Optional[float] = None
+    return_on_equity: Optional[float] = None
+    profit_margins: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    beta: Optional[float] = None
+    business_summary: Optional[str] = None
+    full_time_employees: Optional[int] = None
+    start_date: Any = None
+    website: Optional[str] = None
+    country: Optional[str] = None
+    currency: Optional[str] = None
+
+    @classmethod
+    def from_info(cls, symbol, info):
+        """Project a yfinance `info` dict onto a snapshot."""
+        info = info or {}
+        return cls(symbol=symbol, **{name: info.get(key) for name, key in _INFO_KEYS.items()})
+
+    def to_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
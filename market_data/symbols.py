@@ -0,0 +1,164 @@
+import bisect
+import csv
+import os
+import re
+import threading
+from collections import defaultdict
+
+
+BUNDLED_SYMBOLS = os.path.join(os.path.dirname(__file__), "symbols.csv")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Lowercase `text` and collapse punctuation, so "Coca-Cola" and "coca cola" compare equal."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def trigrams(text):
+    padded = f"  {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """
+    In-memory autocomplete index over ticker symbols and company names.
+
+    Prefix matches come from sorted arrays searched with `bisect`: one of
+    symbols and one of every word in every company name, so "micro" finds
+    Microsoft and Micron. When prefixes don't fill the result list, a
+    trigram index supplies fuzzy matches ranked by Dice similarity, which
+    tolerates typos like "nvidea" or "cocacola".
+    """
+
+    def __init__(self, entries=()):
+        self._entries = []
+        self._by_symbol = {}
+        self._symbol_keys = []
+        self._word_keys = []
+        self._grams = defaultdict(set)
+        self._gram_sizes = {}
+        self._lock = threading.Lock()
+        for entry in entries:
+            self.add(*entry)
+
+    @classmethod
+    def from_csv(cls, *paths):
+        """Build an index from CSV files with symbol, name, exchange and optional sector columns."""
+        index = cls()
+        for path in paths:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    index.add(row["symbol"], row.get("name", ""), row.get("exchange", ""), row.get("sector", ""))
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, symbol, name="", exchange="", sector=""):
+        """Add a symbol, or fill in details for one that is already indexed."""
+        symbol = symbol.upper().strip()
+        if not symbol:
+            return
+        with self._lock:
+            if symbol in self._by_symbol:
+                i = self._by_symbol[symbol]
+                old = self._entries[i]
+                self._entries[i] = (symbol, old[1] or name, old[2] or exchange, old[3] or sector)
+                if old[1] or not name:
+                    return
+            else:
+                i = len(self._entries)
+                self._entries.append((symbol, name, exchange, sector))
+                self._by_symbol[symbol] = i
+                bisect.insort(self._symbol_keys, (symbol.lower(), i))
+            for word in set(normalize(name).split()):
+                bisect.insort(self._word_keys, (word, i))
+            grams = trigrams(symbol) | trigrams(name)
+            for gram in grams:
+                self._grams[gram].add(i)
+            self._gram_sizes[i] = len(grams)
+
+    @staticmethod
+    def _prefix(keys, prefix):
+        start = bisect.bisect_left(keys, (prefix,))
+        for key, i in keys[start:]:
+            if not key.startswith(prefix):
+                break
+            yield i
+
+    def sector(self, symbol):
+        """Return the sector recorded for `symbol`, or "" if unknown."""
+        i = self._by_symbol.get(symbol.upper())
+        return self._entries[i][3] if i is not None else ""
+
+    def sectors(self):
+        """Return {symbol: sector} for every indexed symbol with a known sector."""
+        with self._lock:
+            return {symbol: sector for symbol, _, _, sector in self._entries if sector}
+
+    def search(self, query, max_results=5):
+        """Return up to `max_results` (symbol, name, exchange) tuples matching `query`."""
+        norm = normalize(query)
+        if not norm:
+            return []
+        with self._lock:
+            ranked = []
+            seen = set()
+
+            def take(ids):
+                for i in ids:
+                    if i not in seen:
+                        seen.add(i)
+                        ranked.append(i)
+
+            exact = self._by_symbol.get(query.upper().strip())
+            if exact is not None:
+                take([exact])
+            # Shorter symbols first, so "A" ranks ahead of "AAPL" and "AMZN"
+            take(sorted(self._prefix(self._symbol_keys, norm.replace(" ", "")),
+                        key=lambda i: len(self._entries[i][0])))
+            words = norm.split()
+            name_hits = set(self._prefix(self._word_keys, words[0]))
+            for word in words[1:]:
+                name_hits &= set(self._prefix(self._word_keys, word))
+            take(sorted(name_hits, key=lambda i: self._entries[i][1]))
+
+            # Fuzzy matching on very short queries mostly returns noise
+            if len(ranked) < max_results and len(norm) >= 4:
+                grams = trigrams(query)
+                scores = defaultdict(int)
+                for gram in grams:
+                    for i in self._grams.get(gram, ()):
+                        scores[i] += 1
+                # Require most of the query to match, then prefer the closest overall (Dice) match
+                fuzzy = sorted(
+                    (-2 * shared / (len(grams) + self._gram_sizes[i]), i)
+                    for i, shared in scores.items() if shared >= 0.5 * len(grams)
+                )
+                take(i for _, i in fuzzy)
+
+            return [self._entries[i][:3] for i in ranked[:max_results]]
+
+
+_symbol_index = None
+_symbol_index_lock = threading.Lock()
+
+
+def get_symbol_index():
+    """
+    Return the process-wide symbol index, built on first use.
+
+    It is seeded from the bundled symbols.csv plus, if set, the CSV named by
+    SSGPT_SYMBOLS_FILE (e.g. a full exchange listing refreshed nightly).
+    """
+    global _symbol_index
+    with _symbol_index_lock:
+        if _symbol_index is None:
+            paths = [BUNDLED_SYMBOLS]
+            extra = os.environ.get("SSGPT_SYMBOLS_FILE")
+            if extra and os.path.exists(extra):
+                paths.append(extra)
+            _symbol_index = SymbolIndex.from_csv(*paths)
+        return _symbol_index
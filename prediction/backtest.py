@@ -0,0 +1,245 @@
+import argparse
+import pickle
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from market_data.bar_store import bar_panel, bar_store
+from prediction.forecast_store import day_numbers
+from prediction.models import MODELS
+
+
+DEFAULT_HORIZONS = (1, 5, 20)
+
+
+class LastClose:
+    """Naive baseline: every future close equals the last one. Any useful model should beat it."""
+
+    def __init__(self, close):
+        self.close = close
+
+    @classmethod
+    def fit(cls, days, closes):
+        return cls(float(closes[-1]))
+
+    def forecast(self, days):
+        return np.full(days, self.close)
+
+
+# Models the harness can evaluate: the forecast store's models plus the naive baseline
+BACKTEST_MODELS = {**MODELS, "last_close": LastClose}
+
+
+def synthetic_closes(tickers=50, bars=756, seed=0):
+    """
+    (business day x ticker) closes following geometric random walks with per-ticker drift and volatility.
+
+    For running the harness offline; the same seed gives the same panel.
+    """
+    rng = np.random.default_rng(seed)
+    drift = rng.normal(0.0003, 0.0005, tickers)
+    vol = rng.uniform(0.008, 0.03, tickers)
+    returns = rng.normal(drift, vol, (bars, tickers))
+    closes = 100 * np.exp(np.cumsum(returns, axis=0))
+    index = pd.bdate_range(end=pd.Timestamp("2025-12-31"), periods=bars, name="Date")
+    return pd.DataFrame(closes, index=index, columns=[f"SYN{i:04d}" for i in range(tickers)])
+
+
+def cached_closes(tickers, period="5y", store=bar_store):
+    """(date x ticker) closes for `tickers` from the bar store, which only fetches what it has not cached."""
+    return bar_panel(store.history_many(tickers, period))
+
+
+def _evaluate_ticker(ticker, days, closes, models, window, horizons, step):
+    """
+    Walk one ticker's history forward; runs in a worker process.
+
+    At every `step`-th origin the model is fitted on the `window` closes
+    before it and asked for max(horizons) closes. Returns one row per
+    (model, horizon) with summed errors and timings for aggregation.
+    """
+    valid = ~np.isnan(closes)
+    days, closes = days[valid], closes[valid]
+    longest = max(horizons)
+    origins = np.arange(window, len(closes) - longest + 1, step)
+    horizon_index = np.asarray(horizons) - 1
+    rows = []
+    for name in models:
+        model = BACKTEST_MODELS[name]
+        predicted = np.empty((len(origins), len(horizons)))
+        fit_seconds = predict_seconds = 0.0
+        for i, origin in enumerate(origins):
+            start = time.perf_counter()
+            state = model.fit(days[origin - window:origin], closes[origin - window:origin])
+            fitted = time.perf_counter()
+            predicted[i] = state.forecast(longest)[horizon_index]
+            predict_seconds += time.perf_counter() - fitted
+            fit_seconds += fitted - start
+
+        if not len(origins):
+            continue
+        actual = closes[origins[:, None] + horizon_index]
+        last = closes[origins - 1][:, None]
+        errors = np.abs(predicted - actual)
+        direction = np.sign(predicted - last) == np.sign(actual - last)
+        for j, horizon in enumerate(horizons):
+            rows.append({
+                "Ticker": ticker, "Model": name, "Horizon": horizon, "Forecasts": len(origins),
+                "AbsError": errors[:, j].sum(), "AbsPctError": (errors[:, j] / np.abs(actual[:, j])).sum(),
+                "DirectionHits": int(direction[:, j].sum()),
+                "FitSeconds": fit_seconds, "PredictSeconds": predict_seconds,
+            })
+    return rows
+
+
+def run_backtest(closes, models=None, window=252, horizons=DEFAULT_HORIZONS, step=5, workers=None):
+    """
+    Walk-forward evaluation of forecasting models over a panel of closes.
+
+    Parameters
+    ----------
+    closes : pandas.DataFrame
+        (date x ticker) closing prices, e.g. from synthetic_closes or cached_closes.
+    models : list of str, optional
+        Names from BACKTEST_MODELS; all of them by default.
+    window : int
+        Bars each fit is trained on.
+    horizons : tuple of int
+        Bars ahead to score each forecast at.
+    step : int
+        Bars between forecast origins.
+    workers : int, optional
+        Process pool size; tickers are spread over the pool. `0` runs
+        everything in this process.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per (ticker, model, horizon) with MAE, MAPE (%), directional
+        accuracy (%), the number of forecasts and mean fit / predict time in
+        milliseconds. See summarize() for per-model totals. Directional
+        accuracy compares the sign of the predicted and actual change from
+        the last close, so a flat forecast (e.g. last_close) never scores.
+    """
+    models = list(models or BACKTEST_MODELS)
+    unknown = [name for name in models if name not in BACKTEST_MODELS]
+    if unknown:
+        raise KeyError(f"Unknown model: {', '.join(unknown)}")
+    days = day_numbers(closes.index)
+    jobs = [(ticker, days, closes[ticker].to_numpy(dtype="float64"), models, window, tuple(horizons), step)
+            for ticker in closes.columns]
+
+    if len(jobs) > 1 and workers != 0:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_evaluate_ticker, *zip(*jobs), chunksize=max(1, len(jobs) // 32)))
+    else:
+        results = [_evaluate_ticker(*job) for job in jobs]
+
+    rows = pd.DataFrame([row for result in results for row in result])
+    if rows.empty:
+        return pd.DataFrame(columns=["Ticker", "Model", "Horizon", "Forecasts", "MAE", "MAPE", "Directional",
+                                     "Fit_ms", "Predict_ms"])
+    return _metrics(rows, ["Ticker", "Model", "Horizon"])
+
+
+def summarize(results):
+    """Pool per-ticker backtest rows into one row per (model, horizon), weighting tickers by forecast count."""
+    rows = results.assign(
+        AbsError=results["MAE"] * results["Forecasts"],
+        AbsPctError=results["MAPE"] / 100 * results["Forecasts"],
+        DirectionHits=results["Directional"] / 100 * results["Forecasts"],
+        FitSeconds=results["Fit_ms"] / 1000 * results["Forecasts"],
+        PredictSeconds=results["Predict_ms"] / 1000 * results["Forecasts"],
+    )
+    return _metrics(rows, ["Model", "Horizon"])
+
+
+def benchmark_models(closes, models=None, window=252, days=5, profiled=5):
+    """
+    Fit-time and memory profile of each model on the last `window` closes of every ticker.
+
+    Returns one row per model with the median fit and `days`-ahead forecast
+    time in milliseconds, the peak memory a fit allocates (KiB, measured
+    with tracemalloc on the first `profiled` tickers, largest wins) and the
+    median pickled size of a fitted state, i.e. what the forecast store
+    keeps per ticker. Read it next to summarize(run_backtest(...)) to pick
+    a model per use case.
+    """
+    models = list(models or BACKTEST_MODELS)
+    windows = []
+    for ticker in closes.columns:
+        series = closes[ticker].dropna().iloc[-window:]
+        if len(series):
+            windows.append((day_numbers(series.index), series.to_numpy(dtype="float64")))
+
+    rows = []
+    for name in models:
+        model = BACKTEST_MODELS[name]
+        fit_ms, predict_ms, sizes = [], [], []
+        for days_, values in windows:
+            start = time.perf_counter()
+            state = model.fit(days_, values)
+            fitted = time.perf_counter()
+            state.forecast(days)
+            predict_ms.append((time.perf_counter() - fitted) * 1000)
+            fit_ms.append((fitted - start) * 1000)
+            sizes.append(len(pickle.dumps(state)))
+
+        peak = 0
+        for days_, values in windows[:profiled]:
+            tracemalloc.start()
+            model.fit(days_, values)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        rows.append({
+            "Model": name, "Fits": len(windows),
+            "Fit_ms": np.median(fit_ms) if windows else np.nan,
+            "Predict_ms": np.median(predict_ms) if windows else np.nan,
+            "Peak_KiB": peak / 1024,
+            "State_bytes": int(np.median(sizes)) if windows else 0,
+        })
+    return pd.DataFrame(rows, columns=["Model", "Fits", "Fit_ms", "Predict_ms", "Peak_KiB", "State_bytes"])
+
+
+def _metrics(rows, keys):
+    totals = rows.groupby(keys, sort=False)[
+        ["Forecasts", "AbsError", "AbsPctError", "DirectionHits", "FitSeconds", "PredictSeconds"]
+    ].sum()
+    # One forecast per origin and horizon, so timings per forecast are timings per fit
+    count = totals["Forecasts"]
+    return pd.DataFrame({
+        "Forecasts": count.astype(int),
+        "MAE": totals["AbsError"] / count,
+        "MAPE": totals["AbsPctError"] / count * 100,
+        "Directional": totals["DirectionHits"] / count * 100,
+        "Fit_ms": totals["FitSeconds"] / count * 1000,
+        "Predict_ms": totals["PredictSeconds"] / count * 1000,
+    }).reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the price forecasting models")
+    parser.add_argument("tickers", nargs="*", help="Tickers to load from the bar store (default: synthetic data)")
+    parser.add_argument("--period", default="5y", help="History to load for real tickers")
+    parser.add_argument("--synthetic", type=int, default=100, help="Number of synthetic tickers")
+    parser.add_argument("--bars", type=int, default=756, help="Bars per synthetic ticker")
+    parser.add_argument("--models", nargs="+", choices=list(BACKTEST_MODELS))
+    parser.add_argument("--window", type=int, default=252)
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS))
+    parser.add_argument("--step", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (0 = no pool)")
+    parser.add_argument("--benchmark", action="store_true", help="Also profile fit time and memory per model")
+    args = parser.parse_args()
+
+    panel = cached_closes(args.tickers, args.period) if args.tickers else synthetic_closes(args.synthetic, args.bars)
+    started = time.perf_counter()
+    results = run_backtest(panel, args.models, args.window, args.horizons, args.step, args.workers)
+    elapsed = time.perf_counter() - started
+    print(summarize(results).round(3).to_string(index=False))
+    print(f"\n{panel.shape[1]} tickers x {panel.shape[0]} bars in {elapsed:.2f}s")
+    if args.benchmark:
+        print()
+        print(benchmark_models(panel, args.models, args.window).round(3).to_string(index=False))
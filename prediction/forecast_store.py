@@ -0,0 +1,186 @@
+import os
+import pickle
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from prediction.models import MODELS
+
+
+DEFAULT_DB_PATH = os.environ.get("SSGPT_FORECAST_DB", os.path.join(".cache", "forecasts.db"))
+
+# States kept per (ticker, model); older ones are pruned on save
+KEEP_STATES = 5
+
+
+def day_numbers(dates):
+    """Calendar day numbers (days since 1970-01-01) of a sequence of dates, ignoring time zone."""
+    if not isinstance(dates, pd.DatetimeIndex):
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy().astype("datetime64[D]").astype("int64")
+
+
+class ForecastStore:
+    """
+    Persisted fitted model state, keyed by (ticker, model, last bar date).
+
+    A prediction for a window the store has already fitted is answered from
+    the saved state without refitting. When the window has moved on (a new
+    bar arrived, old bars fell off the front, or the last bar was revised),
+    the latest saved state is updated incrementally instead of refitted.
+    States live in memory and in SQLite, so they survive restarts.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._states = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.updates = 0
+        self.fits = 0
+        self._ready = False
+
+    def _connect(self):
+        """Open the database, creating it and its table on first use."""
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        if not self._ready:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS forecast_state (
+                    ticker TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    last_date TEXT NOT NULL,
+                    state BLOB NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (ticker, model, last_date)
+                )
+            ''')
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def _load(self, tickers, model):
+        """Latest saved state of each ticker that has one, in one query."""
+        try:
+            conn = self._connect()
+            rows = conn.execute(f'''
+                SELECT ticker, state FROM forecast_state AS s
+                WHERE model = ? AND ticker IN ({",".join("?" * len(tickers))}) AND last_date = (
+                    SELECT MAX(last_date) FROM forecast_state WHERE ticker = s.ticker AND model = s.model
+                )
+            ''', (model, *tickers)).fetchall()
+            conn.close()
+        except (OSError, sqlite3.Error):
+            return {}
+        return {ticker: pickle.loads(state) for ticker, state in rows}
+
+    def _save(self, rows):
+        try:
+            conn = self._connect()
+            conn.executemany('''
+                INSERT OR REPLACE INTO forecast_state (ticker, model, last_date, state) VALUES (?, ?, ?, ?)
+            ''', [(ticker, model, str(np.datetime64(state.last_day, "D")), pickle.dumps(state))
+                  for ticker, model, state in rows])
+            conn.executemany('''
+                DELETE FROM forecast_state WHERE ticker = ? AND model = ? AND last_date NOT IN (
+                    SELECT last_date FROM forecast_state WHERE ticker = ? AND model = ?
+                    ORDER BY last_date DESC LIMIT ?
+                )
+            ''', [(ticker, model, ticker, model, KEEP_STATES) for ticker, model, _ in rows])
+            conn.commit()
+            conn.close()
+        except (OSError, sqlite3.Error):
+            # Without a writable database the in-memory states still serve this process
+            pass
+
+    def _resolve(self, ticker, model, days, closes):
+        """Return (state, changed) for this window, reusing or updating the latest known state."""
+        key = (ticker.upper(), model)
+        if key not in self._states:
+            self._states.update(((t, model), state) for t, state in self._load([key[0]], model).items())
+        state = self._states.get(key)
+        if state is not None and state.matches(days, closes):
+            self.hits += 1
+            self._states[key] = state
+            return state, False
+        state = state.update(days, closes) if state is not None else None
+        if state is not None:
+            self.updates += 1
+        else:
+            state = MODELS[model].fit(days, closes)
+            self.fits += 1
+        self._states[key] = state
+        return state, True
+
+    def state(self, ticker, history, model="linear_trend"):
+        """
+        Fitted state of `model` for a ticker's history window.
+
+        `history` has 'Date' and 'Close' columns, like predict_stock takes;
+        rows without a close are ignored.
+        """
+        days, closes = self._window(history['Date'], history['Close'])
+        with self._lock:
+            state, changed = self._resolve(ticker, model, days, closes)
+        if changed:
+            self._save([(ticker.upper(), model, state)])
+        return state
+
+    def predict(self, ticker, history, days=5, model="linear_trend"):
+        """
+        Predict the next `days` closes, reusing saved state.
+
+        Returns the same Date / Predicted_Close frame as
+        prediction.linear_regression.predict_stock.
+        """
+        state = self.state(ticker, history, model)
+        last_date = pd.to_datetime(history['Date'].iloc[-1])
+        return pd.DataFrame({
+            'Date': pd.date_range(last_date + pd.Timedelta(days=1), periods=days),
+            'Predicted_Close': state.forecast(days),
+        })
+
+    def refresh_many(self, histories, model="linear_trend"):
+        """
+        Bring the saved state of many tickers up to date, e.g. in a nightly job.
+
+        `histories` maps ticker to a bar frame indexed by date with a 'Close'
+        column (what BarStore.history_many returns). Tickers with no bars are
+        skipped. All changed states are written in one transaction. Returns
+        {ticker: state}.
+        """
+        histories = {ticker: bars for ticker, bars in histories.items() if bars is not None and not bars.empty}
+        states, changed = {}, []
+        with self._lock:
+            missing = [t.upper() for t in histories if (t.upper(), model) not in self._states]
+            # SQLite caps the number of bound parameters per statement
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                loaded = self._load(chunk, model)
+                # None marks tickers with nothing saved, so they are not looked up again one by one
+                self._states.update(((t, model), loaded.get(t)) for t in chunk)
+            for ticker, bars in histories.items():
+                days, closes = self._window(bars.index, bars['Close'])
+                if not len(days):
+                    continue
+                state, is_changed = self._resolve(ticker, model, days, closes)
+                states[ticker] = state
+                if is_changed:
+                    changed.append((ticker.upper(), model, state))
+        if changed:
+            self._save(changed)
+        return states
+
+    @staticmethod
+    def _window(dates, closes):
+        closes = closes.to_numpy(dtype="float64")
+        valid = ~np.isnan(closes)
+        return day_numbers(dates)[valid], closes[valid]
+
+
+forecast_store = ForecastStore()
@@ -1,6 +1,48 @@
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
+
+
+def trend_forecast(closes, days):
+    """
+    Fit a straight-line trend to every column of `closes` and extrapolate it.
+
+    Parameters
+    ----------
+    closes : numpy.ndarray
+        (bars x tickers) closing prices in time order. NaN marks bars a
+        ticker has no price for (e.g. before it listed) and is ignored.
+    days : int
+        Number of future bars to predict.
+
+    Returns
+    -------
+    numpy.ndarray
+        (days x tickers) predictions for the `days` bars after the last row.
+
+    Ordinary least squares of price on bar number, solved in closed form for
+    all tickers at once: slope = sum(w * dx * y) / sum(w * dx^2) with dx the
+    bar number minus each ticker's mean bar number over its valid bars (w).
+    A ticker with a single price gets a flat forecast; one with no prices
+    gets NaN.
+    """
+    closes = np.asarray(closes, dtype="float64")
+    valid = ~np.isnan(closes)
+    y = np.where(valid, closes, 0.0)
+    x = np.arange(len(closes), dtype="float64")[:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = valid.sum(axis=0)
+        mean_x = (valid * x).sum(axis=0) / count
+        mean_y = y.sum(axis=0) / count
+        dx = np.where(valid, x - mean_x, 0.0)
+        spread = (dx * dx).sum(axis=0)
+        slope = np.where(spread > 0, (dx * y).sum(axis=0) / spread, 0.0)
+
+    future_x = np.arange(len(closes), len(closes) + days, dtype="float64")[:, None]
+    return mean_y + slope * (future_x - mean_x)
+
 
 def predict_stock(df, days=5):
     """
@@ -18,33 +60,118 @@ def predict_stock(df, days=5):
     predictions : pandas.DataFrame
         DataFrame with future dates and predicted closing prices.
     """
+    predictions = trend_forecast(df['Close'].to_numpy(dtype="float64")[:, None], days)[:, 0]
+    future_dates = pd.date_range(pd.to_datetime(df['Date'].iloc[-1]) + pd.Timedelta(days=1), periods=days)
+
+    return pd.DataFrame({
+        'Date': future_dates,
+        'Predicted_Close': predictions
+    })
+
+
+def predict_stock_many(closes, days=5):
+    """
+    Predict next 'days' closing prices for many tickers in one pass.
 
-    # Make sure Date is in datetime format
-    df = df[['Date', 'Close']].copy()
-    df['Date'] = pd.to_datetime(df['Date'])
+    Parameters
+    ----------
+    closes : pandas.DataFrame
+        (date x ticker) closing prices, e.g. from market_data.bar_store.bar_panel.
+    days : int
+        Number of future days to predict.
 
-    # Convert dates into numeric sequence
-    df['Days'] = np.arange(len(df))
+    Returns
+    -------
+    predictions : pandas.DataFrame
+        (future date x ticker) predicted closing prices, with the dates
+        predict_stock gives for the panel's last date. Bar numbers follow the
+        panel rows, so a ticker whose history only starts later matches
+        predict_stock on its own history; missing prices are skipped.
+    """
+    predictions = trend_forecast(closes.to_numpy(dtype="float64"), days)
+    future_dates = pd.date_range(pd.to_datetime(closes.index[-1]) + pd.Timedelta(days=1), periods=days, name='Date')
+    return pd.DataFrame(predictions, index=future_dates, columns=closes.columns)
 
-    # Features and target
-    X = df[['Days']]
-    y = df['Close']
 
-    # Train model
-    model = LinearRegression()
-    model.fit(X, y)
+@dataclass
+class TrendState:
+    """
+    Sufficient statistics of the least-squares trend through a window of closes.
 
-    # Generate future days
-    future_days = np.arange(len(df), len(df) + days).reshape(-1, 1)
-    future_dates = pd.date_range(df['Date'].iloc[-1] + pd.Timedelta(days=1), periods=days)
+    Bars are numbered from `first_x`; the window's day numbers and closes
+    are kept so the oldest bars can be removed again when the window slides.
+    Adding, removing or revising bars only touches the five sums, so moving
+    a one-year window forward by a day costs O(new bars), not a refit.
+    """
+    days: np.ndarray
+    closes: np.ndarray
+    first_x: int = 0
+    sum_x: float = 0.0
+    sum_y: float = 0.0
+    sum_xx: float = 0.0
+    sum_xy: float = 0.0
 
-    # Predict
-    predictions = model.predict(future_days).flatten()
+    @classmethod
+    def fit(cls, days, closes):
+        state = cls(days=np.asarray(days, dtype="int64"), closes=np.asarray(closes, dtype="float64"))
+        state._accumulate(np.arange(len(state.closes), dtype="float64"), state.closes, 1)
+        return state
 
-    # Return as DataFrame
-    result = pd.DataFrame({
-        'Date': future_dates,
-        'Predicted_Close': predictions
-    })
+    @property
+    def n(self):
+        return len(self.closes)
+
+    @property
+    def last_day(self):
+        return int(self.days[-1])
+
+    def _accumulate(self, x, y, sign):
+        self.sum_x += sign * x.sum()
+        self.sum_y += sign * y.sum()
+        self.sum_xx += sign * (x * x).sum()
+        self.sum_xy += sign * (x * y).sum()
+
+    def matches(self, days, closes):
+        """Whether this state was fitted on exactly this window (same ends and same closes throughout)."""
+        return (len(days) == self.n and self.n > 0 and days[0] == self.days[0] and days[-1] == self.days[-1]
+                and np.array_equal(closes, self.closes))
+
+    def update(self, days, closes):
+        """
+        Return the state for the window (`days`, `closes`), or None if it needs a refit.
+
+        When the new window starts no earlier than this one and contains
+        this window's last day, bars that fell off the front are removed,
+        the last bar is revised if its close changed (it may have still been
+        forming) and newer bars are added. Any other changed close (e.g.
+        prices re-adjusted after a dividend) needs a refit.
+        """
+        days = np.asarray(days, dtype="int64")
+        closes = np.asarray(closes, dtype="float64")
+        drop = int(np.searchsorted(self.days, days[0])) if len(days) else self.n
+        pos = int(np.searchsorted(days, self.last_day))
+        if (drop >= self.n or pos >= len(days) or days[pos] != self.last_day
+                or not np.array_equal(self.days[drop:], days[:pos + 1])
+                or not np.array_equal(self.closes[drop:-1], closes[:pos])):
+            return None
+
+        state = TrendState(days, closes, self.first_x, self.sum_x, self.sum_y, self.sum_xx, self.sum_xy)
+        last_x = self.first_x + self.n - 1
+        state._accumulate(np.arange(self.first_x, self.first_x + drop, dtype="float64"), self.closes[:drop], -1)
+        revision = closes[pos] - self.closes[-1]
+        state.sum_y += revision
+        state.sum_xy += last_x * revision
+        state._accumulate(np.arange(last_x + 1, last_x + len(days) - pos, dtype="float64"), closes[pos + 1:], 1)
+        state.first_x += drop
+        return state
 
-    return result
+    def forecast(self, days):
+        """Predictions for the `days` bars after the window."""
+        n = self.n
+        if n == 0:
+            return np.full(days, np.nan)
+        mean_x, mean_y = self.sum_x / n, self.sum_y / n
+        spread = self.sum_xx - n * mean_x * mean_x
+        slope = (self.sum_xy - n * mean_x * mean_y) / spread if n > 1 and spread > 0 else 0.0
+        future_x = np.arange(self.first_x + n, self.first_x + n + days, dtype="float64")
+        return mean_y + slope * (future_x - mean_x)
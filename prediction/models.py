@@ -0,0 +1,220 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from prediction.linear_regression import TrendState
+
+
+class WindowModel:
+    """
+    Base for fitted models that are refitted whenever their window moves.
+
+    Subclasses fit in __init__(days, closes) and implement forecast(days).
+    The window's ends and a checksum of its closes are remembered so the
+    forecast store can tell whether a saved fit still applies; update()
+    returns None, which makes the store refit instead of updating
+    incrementally.
+    """
+
+    def __init__(self, days, closes):
+        self.n = len(closes)
+        self.first_day = int(days[0]) if self.n else None
+        self.last_day = int(days[-1]) if self.n else None
+        self.last_close = float(closes[-1]) if self.n else np.nan
+        self.checksum = zlib.crc32(np.ascontiguousarray(closes).tobytes())
+
+    @classmethod
+    def fit(cls, days, closes):
+        return cls(np.asarray(days, dtype="int64"), np.asarray(closes, dtype="float64"))
+
+    def matches(self, days, closes):
+        return (len(days) == self.n and self.n > 0 and days[0] == self.first_day and days[-1] == self.last_day
+                and zlib.crc32(np.ascontiguousarray(closes).tobytes()) == self.checksum)
+
+    def update(self, days, closes):
+        return None
+
+
+class HoltWinters(WindowModel):
+    """
+    Additive Holt-Winters exponential smoothing with a damped trend and a weekly season.
+
+    The smoothing weights are picked from a small grid by one-step-ahead
+    squared error. All grid points run through the recursion together as
+    vectors, so a fit is a single pass over the window.
+    """
+    season_length = 5
+    alphas = (0.1, 0.3, 0.5, 0.7, 0.9)
+    betas = (0.01, 0.05, 0.2)
+    gammas = (0.0, 0.05, 0.2)
+    damping = 0.98
+
+    def __init__(self, days, closes):
+        super().__init__(days, closes)
+        m = self.season_length
+        self.season = np.zeros(m)
+        self.level, self.trend = self.last_close, 0.0
+        if self.n < 2 * m + 2:
+            return
+
+        alpha, beta, gamma = (grid.ravel() for grid in np.meshgrid(self.alphas, self.betas, self.gammas, indexing="ij"))
+        phi = self.damping
+        # Initial state from up to four whole seasons: their mean level, slope and average shape
+        seasons = closes[:m * min(4, self.n // m)].reshape(-1, m)
+        level = np.full(len(alpha), seasons[0].mean())
+        trend = np.full(len(alpha), (seasons[-1].mean() - seasons[0].mean()) / (m * max(len(seasons) - 1, 1)))
+        season = np.tile((seasons - seasons.mean(axis=1, keepdims=True)).mean(axis=0), (len(alpha), 1))
+
+        sse = np.zeros(len(alpha))
+        for t in range(m, self.n):
+            y, s = closes[t], season[:, t % m]
+            sse += (y - (level + phi * trend + s)) ** 2
+            new_level = alpha * (y - s) + (1 - alpha) * (level + phi * trend)
+            trend = beta * (new_level - level) + (1 - beta) * phi * trend
+            season[:, t % m] = gamma * (y - new_level) + (1 - gamma) * s
+            level = new_level
+
+        best = int(np.argmin(sse))
+        self.alpha, self.beta, self.gamma = alpha[best], beta[best], gamma[best]
+        self.level, self.trend, self.season = level[best], trend[best], season[best]
+
+    def forecast(self, days):
+        steps = np.arange(1, days + 1)
+        damped = np.cumsum(self.damping ** steps)
+        seasonal = self.season[(self.n + steps - 1) % self.season_length]
+        return self.level + damped * self.trend + seasonal
+
+
+def _log_returns(closes):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(closes))
+    return returns[np.isfinite(returns)]
+
+
+class LaggedReturnRidge(WindowModel):
+    """
+    Ridge regression of the next log return on the previous `lags` returns.
+
+    Solved in closed form on the centred lag matrix, with a penalty scaled
+    to the features' variance; multi-day forecasts feed predicted returns
+    back in as lags and compound them onto the last close.
+    """
+    lags = 10
+    penalty = 1.0
+
+    def __init__(self, days, closes):
+        super().__init__(days, closes)
+        returns = _log_returns(closes)
+        p = self.lags
+        self.coef, self.mean_x, self.mean_y = np.zeros(p), np.zeros(p), 0.0
+        self.recent = np.zeros(p)
+        if len(returns) <= 2 * p:
+            return
+
+        lagged = sliding_window_view(returns[:-1], p)
+        target = returns[p:]
+        self.mean_x, self.mean_y = lagged.mean(axis=0), target.mean()
+        centred = lagged - self.mean_x
+        gram = centred.T @ centred
+        self.recent = returns[-p:]
+        if np.trace(gram) == 0:
+            # Constant returns (e.g. a halted ticker's flat prices): nothing to regress on
+            return
+        ridge = self.penalty * np.trace(gram) / p
+        self.coef = np.linalg.solve(gram + ridge * np.eye(p), centred.T @ (target - self.mean_y))
+
+    def forecast(self, days):
+        lags = list(self.recent)
+        predicted = []
+        for _ in range(days):
+            step = self.mean_y + (np.asarray(lags[-self.lags:]) - self.mean_x) @ self.coef
+            predicted.append(step)
+            lags.append(step)
+        return self.last_close * np.exp(np.cumsum(predicted))
+
+
+class AutoRegressive(WindowModel):
+    """
+    AR(`order`) model of log returns estimated with the Yule-Walker equations.
+
+    All autocovariances come from one np.correlate call and the coefficients
+    from one small Toeplitz solve, so there is no per-lag Python loop and
+    the fitted process is always stationary.
+    """
+    order = 5
+
+    def __init__(self, days, closes):
+        super().__init__(days, closes)
+        returns = _log_returns(closes)
+        p = self.order
+        self.coef, self.mean = np.zeros(p), 0.0
+        self.recent = np.zeros(p)
+        if len(returns) <= 2 * p:
+            return
+
+        self.mean = returns.mean()
+        centred = returns - self.mean
+        n = len(centred)
+        autocov = np.correlate(centred, centred, mode="full")[n - 1:n + p] / n
+        if autocov[0] > 0:
+            toeplitz = autocov[np.abs(np.subtract.outer(np.arange(p), np.arange(p)))]
+            self.coef = np.linalg.solve(toeplitz, autocov[1:])
+        # Most recent return first, matching coef[0] for lag 1
+        self.recent = centred[::-1][:p]
+
+    def forecast(self, days):
+        lags = list(self.recent)
+        predicted = []
+        for _ in range(days):
+            step = np.dot(self.coef, lags[:self.order])
+            predicted.append(self.mean + step)
+            lags.insert(0, step)
+        return self.last_close * np.exp(np.cumsum(predicted))
+
+
+# Fitted-state class for each model name; a state offers fit, matches, update (None when it must refit),
+# forecast and last_day
+MODELS = {
+    "linear_trend": TrendState,
+    "holt_winters": HoltWinters,
+    "ridge_lags": LaggedReturnRidge,
+    "ar": AutoRegressive,
+}
+
+MODEL_LABELS = {
+    "linear_trend": "Linear trend",
+    "holt_winters": "Holt-Winters smoothing",
+    "ridge_lags": "Ridge on lagged returns",
+    "ar": "Autoregressive AR(5)",
+}
+
+
+def predict_stock(df, days=5, model="linear_trend"):
+    """
+    Predict next 'days' closing prices with any registered model.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Must contain at least 'Date' and 'Close' columns.
+    days : int
+        Number of future days to predict.
+    model : str
+        Name from MODELS.
+
+    Returns
+    -------
+    predictions : pandas.DataFrame
+        DataFrame with future dates and predicted closing prices, like
+        prediction.linear_regression.predict_stock.
+    """
+    closes = df['Close'].to_numpy(dtype="float64")
+    valid = ~np.isnan(closes)
+    state = MODELS[model].fit(np.flatnonzero(valid), closes[valid])
+    future_dates = pd.date_range(pd.to_datetime(df['Date'].iloc[-1]) + pd.Timedelta(days=1), periods=days)
+    return pd.DataFrame({
+        'Date': future_dates,
+        'Predicted_Close': state.forecast(days)
+    })
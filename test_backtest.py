@@ -0,0 +1,47 @@
+"""
+Tests for the walk-forward backtest harness (prediction.backtest)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction.backtest import BACKTEST_MODELS, run_backtest, summarize, synthetic_closes
+
+
+def test_trend_model_is_exact_on_straight_lines():
+    index = pd.bdate_range("2024-01-01", periods=120)
+    closes = pd.DataFrame({"UP": 50.0 + np.arange(120), "DOWN": 200.0 - np.arange(120)}, index=index)
+
+    results = run_backtest(closes, ["linear_trend", "last_close"], window=40, horizons=(1, 5), step=10, workers=0)
+    trend = results[results["Model"] == "linear_trend"]
+    assert len(results) == 8
+    assert (trend["Forecasts"] == 8).all()
+    np.testing.assert_allclose(trend["MAE"], 0, atol=1e-9)
+    assert (trend["Directional"] == 100).all()
+
+    naive = results[(results["Model"] == "last_close") & (results["Horizon"] == 5)]
+    np.testing.assert_allclose(naive["MAE"], 5.0)
+
+
+def test_process_pool_matches_in_process_and_summary_pools_tickers():
+    closes = synthetic_closes(tickers=4, bars=200, seed=2)
+    closes.iloc[:30, 0] = np.nan
+    metrics = ["Ticker", "Model", "Horizon", "Forecasts", "MAE", "MAPE", "Directional"]
+
+    serial = run_backtest(closes, window=60, horizons=(1, 5, 20), step=7, workers=0)
+    pooled = run_backtest(closes, window=60, horizons=(1, 5, 20), step=7, workers=2)
+    pd.testing.assert_frame_equal(serial[metrics], pooled[metrics])
+
+    summary = summarize(serial)
+    assert len(summary) == 3 * len(BACKTEST_MODELS)
+    line = serial[(serial["Model"] == "linear_trend") & (serial["Horizon"] == 5)]
+    pooled_line = summary[(summary["Model"] == "linear_trend") & (summary["Horizon"] == 5)].iloc[0]
+    assert pooled_line["Forecasts"] == line["Forecasts"].sum()
+    assert pooled_line["MAE"] == pytest.approx(np.average(line["MAE"], weights=line["Forecasts"]))
+    assert (summary["Fit_ms"] > 0).all()
+
+
+def test_unknown_model_is_rejected():
+    with pytest.raises(KeyError):
+        run_backtest(synthetic_closes(tickers=1, bars=50), ["nope"], workers=0)
@@ -0,0 +1,111 @@
+"""
+Tests for the on-disk OHLCV bar store (market_data.bar_store)
+"""
+
+import pandas as pd
+
+from market_data.bar_store import BarStore
+
+
+def trading_days(start, end):
+    return pd.bdate_range(start, end, tz="America/New_York")
+
+
+class FakeFetch:
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def __call__(self, ticker, interval, start=None, period=None):
+        self.calls.append({"start": start, "period": period})
+        if start is not None:
+            return self.bars[self.bars.index >= pd.Timestamp(start, tz=self.bars.index.tz)]
+        cutoff = pd.Timestamp.now(tz=self.bars.index.tz) - pd.DateOffset(years=int(period[0]))
+        return self.bars[self.bars.index >= cutoff.normalize()]
+
+
+def test_delta_fetch_only_requests_new_bars(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    bars = make_bars(index=trading_days(today - pd.DateOffset(years=2), today))
+    fetch = FakeFetch(bars.iloc[:-3])
+    store = BarStore(cache_dir=str(tmp_path), fetch=fetch, refresh_interval=0)
+
+    first = store.history("AAPL", "1y")
+    assert fetch.calls[-1]["period"] == "1y"
+
+    fetch.bars = bars
+    second = store.history("AAPL", "1y")
+    assert fetch.calls[-1]["start"] == first.index[-1].strftime("%Y-%m-%d")
+    assert second.index[-1] == bars.index[-1]
+    assert second.index.is_unique
+
+
+def test_failed_refresh_serves_cached_bars(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    fetch = FakeFetch(make_bars(index=trading_days(today - pd.DateOffset(years=1), today)))
+    store = BarStore(cache_dir=str(tmp_path), fetch=fetch, refresh_interval=0)
+    cached = store.history("AAPL", "6mo")
+    checked_at = store._meta[("AAPL", "1d")]["checked_at"]
+
+    def failing(ticker, interval, start=None, period=None):
+        raise ConnectionError("upstream unavailable")
+
+    store.fetch = failing
+    pd.testing.assert_frame_equal(store.history("AAPL", "6mo"), cached)
+    assert store._meta[("AAPL", "1d")]["checked_at"] == checked_at
+
+
+def test_shorter_periods_are_sliced_locally(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    fetch = FakeFetch(make_bars(index=trading_days(today - pd.DateOffset(years=2), today)))
+    store = BarStore(cache_dir=str(tmp_path), fetch=fetch, refresh_interval=3600)
+
+    store.history("AAPL", "2y")
+    assert len(store.history("AAPL", "5d")) == 5
+    assert len(store.history("AAPL", "1mo")) < len(store.history("AAPL", "1y"))
+    assert len(fetch.calls) == 1
+
+
+def test_cache_survives_restart(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    fetch = FakeFetch(make_bars(index=trading_days(today - pd.DateOffset(years=1), today)))
+    BarStore(cache_dir=str(tmp_path), fetch=fetch).history("MSFT", "1y")
+
+    reloaded = BarStore(cache_dir=str(tmp_path), fetch=fetch, refresh_interval=3600)
+    data = reloaded.history("MSFT", "6mo")
+    assert not data.empty
+    assert len(fetch.calls) == 1
+
+
+def test_longer_period_triggers_backfill(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    fetch = FakeFetch(make_bars(index=trading_days(today - pd.DateOffset(years=3), today)))
+    store = BarStore(cache_dir=str(tmp_path), fetch=fetch, refresh_interval=3600)
+
+    short = store.history("NVDA", "1y")
+    longer = store.history("NVDA", "2y")
+    assert fetch.calls[-1]["period"] == "2y"
+    assert len(longer) > len(short)
+
+
+def test_history_many_batches_cold_and_stale_tickers(tmp_path, make_bars):
+    today = pd.Timestamp.now().normalize()
+    year = make_bars(index=trading_days(today - pd.DateOffset(years=1), today)).tz_localize(None)
+    bars = {t: year for t in ["AAPL", "MSFT", "NVDA"]}
+    downloads = []
+
+    def download(tickers, interval, start=None, period=None):
+        downloads.append((list(tickers), start, period))
+        frames = {t: bars[t] if start is None else bars[t][bars[t].index >= start] for t in tickers if t in bars}
+        return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+
+    store = BarStore(cache_dir=str(tmp_path), fetch=FakeFetch(bars["AAPL"]), download=download, refresh_interval=0)
+    result = store.history_many(["AAPL", "msft", "AAPL", "NOPE"], "6mo")
+
+    assert downloads == [(["AAPL", "MSFT", "NOPE"], None, "6mo")]
+    assert list(result) == ["AAPL", "MSFT", "NOPE"]
+    assert not result["MSFT"].empty and result["NOPE"].empty
+
+    store.history_many(["AAPL", "MSFT", "NVDA"], "6mo")
+    assert downloads[1] == (["NVDA"], None, "6mo")
+    assert downloads[2][0] == ["AAPL", "MSFT"] and downloads[2][1] is not None
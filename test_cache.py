@@ -0,0 +1,48 @@
+"""
+Tests for the TTL-classed market data cache (market_data.cache)
+"""
+
+from market_data.cache import MarketDataCache, TTLCache
+from market_data.singleflight import SingleFlight
+
+
+def test_invalidation_is_per_ticker_and_class():
+    cache = MarketDataCache(flight=SingleFlight())
+    calls = []
+
+    def fetcher(kind):
+        return lambda: calls.append(kind) or kind
+
+    cache.fetch("info", "AAPL", fetcher("info"))
+    cache.fetch("intraday", "AAPL", fetcher("intraday"))
+    cache.fetch("intraday", "MSFT", fetcher("intraday"))
+
+    cache.invalidate("AAPL", kind="intraday")
+    cache.fetch("info", "AAPL", fetcher("info"))
+    cache.fetch("intraday", "AAPL", fetcher("intraday"))
+    cache.fetch("intraday", "MSFT", fetcher("intraday"))
+
+    assert calls == ["info", "intraday", "intraday", "intraday"]
+
+
+def test_classes_expire_independently():
+    cache = MarketDataCache(ttls={"quote": 0, "info": 3600}, flight=SingleFlight())
+    calls = []
+    for _ in range(2):
+        cache.fetch("quote", "AAPL", lambda: calls.append("quote"))
+        cache.fetch("info", "AAPL", lambda: calls.append("info"))
+    assert calls == ["quote", "info", "quote"]
+
+
+def test_expired_entries_are_dropped_and_size_is_capped():
+    cache = TTLCache(ttl=0, maxsize=3)
+    cache.set("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+    cache = TTLCache(ttl=3600, maxsize=3)
+    for key in "abcd":
+        cache.set(key, key)
+    cache.set("b", "b2")
+    cache.set("e", "e")
+    assert len(cache) == 3
+    assert [cache.get(k) for k in "abcde"] == [None, "b2", None, "d", "e"]
@@ -0,0 +1,85 @@
+"""
+Tests for the indicator and figure caches and trace helpers (charts.cache, charts.traces)
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from charts.cache import ComputeCache, frame_key, themed
+from charts.traces import WEBGL_MIN_POINTS, compact_dates, line_trace
+
+
+def test_frame_key_tracks_content(make_bars):
+    bars = make_bars(np.linspace(100, 110, 30))
+    assert frame_key("AAPL", "1d", bars) == frame_key("AAPL", "1d", bars.copy())
+
+    revised = bars.copy()
+    revised.iloc[5, 0] += 1
+    assert frame_key("AAPL", "1d", revised) != frame_key("AAPL", "1d", bars)
+    assert frame_key("AAPL", "1d", revised)[2] == frame_key("AAPL", "1d", bars)[2]
+
+
+def test_compute_cache_builds_once_and_evicts_oldest():
+    cache = ComputeCache(maxsize=2)
+    builds = []
+
+    def build(value):
+        return lambda: builds.append(value) or value
+
+    assert cache.get_or_build("a", build(1)) == 1
+    assert cache.get_or_build("a", build(2)) == 1
+    cache.get_or_build("b", build(3))
+    cache.get_or_build("c", build(4))
+    cache.get_or_build("a", build(5))
+    assert builds == [1, 3, 4, 5]
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_prefetch_and_render_share_one_build():
+    cache = ComputeCache()
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    future = cache.prefetch("fig", build)
+    started.wait(5)
+    waiter = ThreadPoolExecutor(1).submit(cache.get_or_build, "fig", build)
+    release.set()
+    assert waiter.result(5) is future.result(5)
+    assert len(builds) == 1
+    assert cache.prefetch("fig", build) is None
+
+
+def test_themed_swaps_only_the_template():
+    fig = go.Figure(go.Scatter(y=[1, 2, 3]))
+    with themed(fig, "plotly_dark"):
+        assert fig.layout.template.layout.paper_bgcolor is not None
+    with themed(fig, "plotly_white"):
+        assert fig.data[0].y == (1, 2, 3)
+
+
+def test_compact_dates_drop_time_for_daily_bars():
+    daily = pd.bdate_range("2025-01-01", periods=3, tz="America/New_York")
+    assert list(compact_dates(daily)) == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+    minutes = pd.date_range("2025-01-02 09:30", periods=2, freq="min", tz="America/New_York")
+    assert list(compact_dates(minutes)) == ["2025-01-02T09:30:00", "2025-01-02T09:31:00"]
+
+
+def test_line_trace_switches_to_webgl_above_threshold():
+    short = pd.Series(np.arange(50.0), index=pd.bdate_range("2020-01-01", periods=50))
+    long = pd.Series(np.arange(3000.0), index=pd.bdate_range("2010-01-01", periods=3000))
+
+    assert line_trace(short).type == "scatter"
+    assert line_trace(long).type == "scattergl"
+    assert line_trace(long, max_points=WEBGL_MIN_POINTS).type == "scatter"
+    assert '"dtype":"f4","bdata"' in go.Figure(line_trace(long)).to_json()
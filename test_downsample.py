@@ -0,0 +1,40 @@
+"""
+Tests for chart downsampling (charts.downsample)
+"""
+
+import numpy as np
+import pandas as pd
+
+from charts.downsample import downsample_line, lttb_indices, resample_mean, resample_ohlc
+
+
+def test_resample_ohlc_keeps_extremes_and_totals(make_bars, random_closes):
+    data = make_bars(random_closes(1000, seed=5))
+    candles = resample_ohlc(data, 300)
+
+    assert len(candles) <= 300
+    assert candles.index[0] == data.index[0]
+    assert candles["High"].max() == data["High"].max()
+    assert candles["Low"].min() == data["Low"].min()
+    assert candles["Volume"].sum() == data["Volume"].sum()
+    assert candles["Open"].iloc[0] == data["Open"].iloc[0]
+    assert candles["Close"].iloc[-1] == data["Close"].iloc[-1]
+    assert resample_ohlc(data, None) is data
+
+    histogram = resample_mean(data["Close"], 300)
+    assert len(histogram) <= 300 and histogram.iloc[0] == data["Close"].iloc[:4].mean()
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234] = 10.0
+    keep = lttb_indices(y, 200)
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert 1234 in keep
+    assert np.all(np.diff(keep) > 0)
+
+    series = pd.Series(np.r_[np.full(50, np.nan), y], index=pd.RangeIndex(5050))
+    line = downsample_line(series, 200)
+    assert len(line) == 200 and not line.isna().any() and line.index[0] == 50
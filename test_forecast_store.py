@@ -0,0 +1,81 @@
+"""
+Tests for incremental trend state and the forecast store (prediction.forecast_store)
+"""
+
+import numpy as np
+import pandas as pd
+
+from prediction.forecast_store import ForecastStore
+from prediction.linear_regression import predict_stock
+
+
+def make_history(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2024-01-01", periods=n, tz="America/New_York"),
+        "Close": 100 + np.cumsum(rng.normal(0.05, 1.0, n)),
+    })
+
+
+def test_sliding_window_updates_match_a_refit(tmp_path):
+    store = ForecastStore(str(tmp_path / "forecasts.db"))
+    history = make_history()
+
+    for end in range(252, 260):
+        window = history.iloc[end - 252:end].reset_index(drop=True)
+        preds = store.predict("AAPL", window, days=5)
+        expected = predict_stock(window, days=5)
+        pd.testing.assert_frame_equal(preds, expected, check_exact=False, rtol=1e-9)
+    assert (store.fits, store.updates) == (1, 7)
+
+    # The still-forming last bar is revised
+    window = window.copy()
+    window.loc[len(window) - 1, "Close"] += 3.0
+    np.testing.assert_allclose(store.predict("AAPL", window)["Predicted_Close"],
+                               predict_stock(window)["Predicted_Close"])
+    assert store.updates == 8
+
+    # A gap that doesn't line up with the saved window falls back to a refit
+    gappy = window.drop(index=100).reset_index(drop=True)
+    np.testing.assert_allclose(store.predict("AAPL", gappy)["Predicted_Close"],
+                               predict_stock(gappy)["Predicted_Close"])
+    assert store.fits == 2
+
+
+def test_revised_mid_window_closes_force_a_refit(tmp_path):
+    store = ForecastStore(str(tmp_path / "forecasts.db"))
+    history = make_history()
+    store.predict("AAPL", history.iloc[:252])
+
+    # A backfill re-adjusts older prices: neither a hit nor an update may reuse the old sums
+    adjusted = history.copy()
+    adjusted.loc[:200, "Close"] *= 0.98
+    for window in (adjusted.iloc[:252], adjusted.iloc[1:253].reset_index(drop=True)):
+        np.testing.assert_allclose(store.predict("AAPL", window)["Predicted_Close"],
+                                   predict_stock(window)["Predicted_Close"])
+    assert (store.hits, store.updates, store.fits) == (0, 1, 2)
+
+
+def test_repeat_predictions_reuse_saved_state(tmp_path):
+    path = str(tmp_path / "forecasts.db")
+    history = make_history(seed=1)
+    ForecastStore(path).predict("MSFT", history)
+
+    reopened = ForecastStore(path)
+    preds = reopened.predict("MSFT", history, days=3)
+    assert (reopened.hits, reopened.fits) == (1, 0)
+    np.testing.assert_allclose(preds["Predicted_Close"], predict_stock(history, days=3)["Predicted_Close"])
+
+
+def test_refresh_many_updates_every_ticker(tmp_path):
+    store = ForecastStore(str(tmp_path / "forecasts.db"))
+    frames = {t: make_history(seed=i).set_index("Date") for i, t in enumerate(["A", "B", "C"])}
+    frames["EMPTY"] = pd.DataFrame()
+
+    states = store.refresh_many({t: f.iloc[:-1] for t, f in frames.items()})
+    assert sorted(states) == ["A", "B", "C"] and store.fits == 3
+    states = store.refresh_many(frames)
+    assert store.updates == 3
+    for ticker in ["A", "B", "C"]:
+        history = frames[ticker].reset_index()
+        np.testing.assert_allclose(states[ticker].forecast(5), predict_stock(history)["Predicted_Close"])
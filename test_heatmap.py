@@ -0,0 +1,51 @@
+"""
+Tests for the market heatmap engine (market_data.heatmap)
+"""
+
+import numpy as np
+import pandas as pd
+
+from market_data.heatmap import HeatmapEngine, horizon_returns, sector_summary
+from market_data.symbols import SymbolIndex
+
+
+def test_horizon_returns_match_pct_change():
+    closes = pd.DataFrame({
+        "A": np.linspace(100, 200, 100),
+        "B": np.linspace(50, 40, 100),
+    }, index=pd.bdate_range(end="2025-03-31", periods=100))
+    returns = horizon_returns(closes, {"1D": 1, "1W": 5, "1Y": 300})
+
+    for column, days in [("1D", 1), ("1W", 5)]:
+        expected = closes.pct_change(days).iloc[-1] * 100
+        assert np.allclose(returns[column], expected)
+    assert returns["1Y"].isna().all()
+
+
+def test_engine_recomputes_only_when_new_bars_arrive(make_bars, fake_store):
+    store = fake_store({
+        "AAPL": make_bars(np.linspace(100, 120, 80)),
+        "MSFT": make_bars(np.linspace(100, 90, 80)),
+        "XOM": make_bars(np.linspace(100, 105, 80)),
+    })
+    index = SymbolIndex([
+        ("AAPL", "Apple Inc.", "NMS", "Information Technology"),
+        ("MSFT", "Microsoft Corporation", "NMS", "Information Technology"),
+        ("XOM", "Exxon Mobil Corporation", "NYQ", "Energy"),
+        ("SPY", "SPDR S&P 500 ETF Trust", "PCX", "ETF"),
+    ])
+    engine = HeatmapEngine(store=store, symbol_index=index)
+
+    assert engine.universe() == ["AAPL", "MSFT", "XOM"]
+    table = engine.compute()
+    assert engine.compute() is table
+    assert engine.computations == 1
+    assert table.loc["XOM", "Sector"] == "Energy"
+    assert table.loc["AAPL", "1D"] > 0 > table.loc["MSFT", "1D"]
+
+    store.frames["AAPL"] = make_bars(np.linspace(100, 130, 81))
+    engine.compute()
+    assert engine.computations == 2
+
+    summary = sector_summary(engine.compute())
+    assert summary.loc["Information Technology", "Stocks"] == 2
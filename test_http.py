@@ -0,0 +1,59 @@
+"""
+Tests for the shared rate-limited upstream client (market_data.http)
+"""
+
+import time
+
+import pytest
+
+from market_data.http import TokenBucket, UpstreamClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_token_bucket_enforces_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.perf_counter()
+    waits = [bucket.acquire() for _ in range(6)]
+    assert time.perf_counter() - start >= 0.15
+    assert waits[0] == waits[1] == 0.0
+    assert waits[-1] > 0
+
+
+def test_costs_above_capacity_are_charged_in_full():
+    bucket = TokenBucket(rate=20, capacity=2)
+    bucket.acquire(2)
+    start = time.perf_counter()
+    waited = bucket.acquire(6)
+    elapsed = time.perf_counter() - start
+    # 6 tokens at 20 per second from an empty bucket
+    assert 0.28 <= waited <= elapsed < 1.0
+
+
+def test_get_retries_throttled_responses():
+    client = UpstreamClient(rate=1000, burst=10, backoff_base=0.001)
+    responses = iter([FakeResponse(429), FakeResponse(503), FakeResponse(200)])
+    client.session.get = lambda url, **kwargs: next(responses)
+
+    assert client.get("https://example.invalid").status_code == 200
+    metrics = client.metrics()
+    assert metrics["calls"] == 3
+    assert metrics["retries"] == 2
+    assert metrics["throttled"] == 1
+
+
+def test_call_gives_up_after_max_retries():
+    client = UpstreamClient(rate=1000, burst=10, max_retries=2, backoff_base=0.001)
+    attempts = []
+
+    def throttled():
+        attempts.append(1)
+        raise TimeoutError("slow down")
+
+    with pytest.raises(TimeoutError):
+        client.call(throttled, retry_on=(TimeoutError,))
+    assert len(attempts) == 3
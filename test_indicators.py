@@ -0,0 +1,55 @@
+"""
+Tests for the technical indicator engines (indicators package)
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicators.panel import panel_from_frames
+from indicators.registry import compute_indicators, resolve
+from indicators.streaming import STREAMING_COLUMNS, RollingExtreme, StreamingIndicators
+from indicators.technical import calculate_technical_indicators
+
+
+def test_streaming_matches_batch_indicators(make_bars, random_closes):
+    bars = make_bars(random_closes(300, seed=7))
+    # yfinance sometimes returns an all-NaN bar; it must not poison the running state
+    bars.iloc[100] = np.nan
+    expected = calculate_technical_indicators(bars.copy())[STREAMING_COLUMNS]
+
+    engine = StreamingIndicators.from_history(bars.iloc[:250])
+    live = [engine.update(*row) for row in bars[["High", "Low", "Close"]].iloc[250:].itertuples(index=False)]
+
+    seeded = StreamingIndicators().run(bars.iloc[:250])
+    actual = pd.concat([seeded, pd.DataFrame(live, index=bars.index[250:])])[STREAMING_COLUMNS]
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False, rtol=1e-7)
+
+
+def test_rolling_extreme_uses_the_window():
+    highs = RollingExtreme(3, "max")
+    assert [highs.update(x) for x in [5, 1, 2, 0, 4]][2:] == [5, 2, 4]
+
+
+def test_panel_matches_per_ticker_indicators(make_bars, random_closes):
+    frames = {"AAA": make_bars(random_closes(300, seed=1)), "BBB": make_bars(random_closes(300, seed=2)).iloc[40:]}
+    panel = panel_from_frames(frames)
+    assert panel.cube.dtype == np.float32
+    assert panel.cube.shape == (len(STREAMING_COLUMNS), 300, 2)
+
+    for ticker, bars in frames.items():
+        expected = calculate_technical_indicators(bars.reindex(panel.index))[STREAMING_COLUMNS]
+        actual = pd.DataFrame(panel.cube[:, :, panel.tickers.index(ticker)].T, index=panel.index,
+                              columns=STREAMING_COLUMNS)
+        pd.testing.assert_frame_equal(actual, expected.astype("float32"), check_freq=False, rtol=1e-4)
+    assert panel.latest().loc["BBB", "SMA_20"] == panel.get("SMA_20")["BBB"].iloc[-1]
+
+
+def test_registry_computes_only_the_requested_subgraph(make_bars, random_closes):
+    assert resolve(["BB_Upper", "SMA_20"]) == ["SMA_20", "BB_Middle", "_bb_std", "BB_Upper"]
+    assert "SMA_50" not in resolve(["RSI", "ATR"])
+    assert resolve(["ATR"]) == ["_true_range", "ATR"]
+
+    bars = make_bars(random_closes(300, seed=7))
+    result = compute_indicators(bars, ["RSI", "BB_Lower"])
+    assert list(result.columns) == list(bars.columns) + ["RSI", "BB_Lower"]
+    assert list(calculate_technical_indicators(bars).columns) == list(bars.columns) + STREAMING_COLUMNS
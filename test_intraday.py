@@ -0,0 +1,62 @@
+"""
+Tests for incremental intraday bars (market_data.intraday)
+"""
+
+import pandas as pd
+
+from market_data.intraday import BarRingBuffer, IntradayStream
+
+
+def minutes(start, periods):
+    return pd.date_range(start, periods=periods, freq="min", tz="America/New_York")
+
+
+def test_ring_buffer_replaces_forming_bar_and_drops_oldest(make_bars):
+    bars = make_bars(index=minutes("2025-03-03 09:30", 8))
+    buffer = BarRingBuffer(capacity=5)
+    assert buffer.extend(bars.iloc[:4]) == 4
+
+    update = bars.iloc[3:6].copy()
+    update.iloc[0, update.columns.get_loc("Close")] = 999.0
+    assert buffer.extend(update) == 3
+
+    frame = buffer.to_frame()
+    assert len(frame) == 5
+    assert frame.loc[bars.index[3], "Close"] == 999.0
+    assert frame.index.equals(bars.index[1:6])
+
+    buffer.extend(bars)
+    assert buffer.to_frame().index.equals(bars.index[3:])
+    assert buffer.last_time == bars.index[-1]
+
+
+def test_stream_fetches_only_the_tail(make_bars):
+    session = make_bars(index=minutes("2025-03-03 09:30", 30))
+    calls = []
+
+    def fetch(ticker, interval, start=None):
+        calls.append(start)
+        if start is None:
+            return session.iloc[:20]
+        return session[session.index >= start]
+
+    stream = IntradayStream(fetch=fetch, refresh_interval=3600)
+    assert len(stream.get("aapl")) == 20
+    assert len(stream.get("AAPL")) == 20
+    assert calls == [None]
+
+    stream.invalidate("AAPL")
+    data = stream.get("AAPL")
+    assert calls[-1] == session.index[19]
+    assert data.index.equals(session.index)
+
+
+def test_stream_resets_on_a_new_session(make_bars):
+    days = [make_bars(index=minutes("2025-03-03 09:30", 10)), make_bars(index=minutes("2025-03-04 09:30", 5))]
+
+    def fetch(ticker, interval, start=None):
+        return days[0] if start is None else pd.concat(days)[lambda d: d.index >= start]
+
+    stream = IntradayStream(fetch=fetch, refresh_interval=0)
+    stream.get("MSFT")
+    assert stream.get("MSFT").index.equals(days[1].index)
@@ -0,0 +1,55 @@
+"""
+Tests for the closed-form trend forecaster (prediction.linear_regression)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction.linear_regression import predict_stock, predict_stock_many
+
+
+def make_history(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2025-01-01", periods=n),
+        "Close": 100 + np.cumsum(rng.normal(0.1, 1.0, n)),
+    })
+
+
+def test_predict_stock_matches_least_squares_fit():
+    history = make_history()
+    preds = predict_stock(history, days=5)
+
+    slope, intercept = np.polyfit(np.arange(len(history)), history["Close"], 1)
+    expected = intercept + slope * np.arange(len(history), len(history) + 5)
+    np.testing.assert_allclose(preds["Predicted_Close"], expected)
+    assert list(preds.columns) == ["Date", "Predicted_Close"]
+    assert preds["Date"].iloc[0] == history["Date"].iloc[-1] + pd.Timedelta(days=1)
+
+
+def test_predict_stock_agrees_with_sklearn():
+    linear_model = pytest.importorskip("sklearn.linear_model")
+    history = make_history(seed=1)
+    x = np.arange(len(history)).reshape(-1, 1)
+    model = linear_model.LinearRegression().fit(x, history["Close"])
+    expected = model.predict(np.arange(len(history), len(history) + 7).reshape(-1, 1))
+    np.testing.assert_allclose(predict_stock(history, days=7)["Predicted_Close"], expected)
+
+
+def test_predict_stock_many_matches_single_ticker_fits():
+    dates = pd.bdate_range("2025-01-01", periods=120)
+    closes = pd.DataFrame({f"T{i}": make_history(seed=i)["Close"].to_numpy() for i in range(4)}, index=dates)
+    closes.iloc[:30, 1] = np.nan  # listed later
+    closes["FLAT"] = np.r_[np.full(119, np.nan), 50.0]
+    closes["EMPTY"] = np.nan
+
+    batch = predict_stock_many(closes, days=3)
+    assert batch.shape == (3, 6)
+    for ticker in ["T0", "T1", "T2", "T3"]:
+        own = closes[ticker].dropna()
+        single = predict_stock(pd.DataFrame({"Date": own.index, "Close": own.to_numpy()}), days=3)
+        np.testing.assert_allclose(batch[ticker], single["Predicted_Close"])
+        assert list(batch.index) == list(single["Date"])
+    assert (batch["FLAT"] == 50.0).all()
+    assert batch["EMPTY"].isna().all()
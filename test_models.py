@@ -0,0 +1,83 @@
+"""
+Tests for the forecasting model registry (prediction.models)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction.backtest import BACKTEST_MODELS, benchmark_models, synthetic_closes
+from prediction.forecast_store import ForecastStore
+from prediction.models import MODELS, AutoRegressive, HoltWinters, LaggedReturnRidge, predict_stock
+
+
+def test_every_model_keeps_the_predict_stock_contract(tmp_path):
+    history = pd.DataFrame({
+        "Date": pd.bdate_range("2024-01-01", periods=300),
+        "Close": 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 300))),
+    })
+    history.loc[10, "Close"] = np.nan
+    store = ForecastStore(str(tmp_path / "forecasts.db"))
+
+    for name in MODELS:
+        preds = predict_stock(history, days=7, model=name)
+        assert list(preds.columns) == ["Date", "Predicted_Close"]
+        assert preds["Date"].iloc[0] == history["Date"].iloc[-1] + pd.Timedelta(days=1)
+        assert np.isfinite(preds["Predicted_Close"]).all()
+        pd.testing.assert_frame_equal(store.predict("AAPL", history, days=7, model=name), preds)
+        store.predict("AAPL", history, days=7, model=name)
+        # Too little history still gives a forecast
+        assert np.isfinite(predict_stock(history.head(3), days=2, model=name)["Predicted_Close"]).all()
+    assert (store.fits, store.hits) == (len(MODELS), len(MODELS))
+
+    # A changed close inside the window is not served from the saved fit
+    history.loc[150, "Close"] *= 1.02
+    pd.testing.assert_frame_equal(store.predict("AAPL", history, model="ar"), predict_stock(history, model="ar"))
+    assert store.fits == len(MODELS) + 1
+
+    with pytest.raises(KeyError):
+        predict_stock(history, model="nope")
+
+
+def test_models_recover_simple_series():
+    days = np.arange(200)
+    pattern = np.array([0.0, 2.0, -1.0, 1.0, -2.0])
+    weekly = HoltWinters.fit(days, 100 + np.tile(pattern, 40))
+    np.testing.assert_allclose(weekly.forecast(7), 100 + pattern[[0, 1, 2, 3, 4, 0, 1]], atol=0.05)
+    line = HoltWinters.fit(days, 100.0 + days)
+    # The damped trend follows a straight line closely but flattens it a little
+    np.testing.assert_allclose(line.forecast(5), 300.0 + np.arange(5), rtol=5e-3)
+    assert (np.diff(line.forecast(5)) > 0.8).all()
+
+    growth = 50 * np.exp(0.01 * days)
+    for model in (LaggedReturnRidge, AutoRegressive):
+        np.testing.assert_allclose(model.fit(days, growth).forecast(5), growth[-1] * np.exp(0.01 * np.arange(1, 6)))
+
+
+def test_constant_prices_give_flat_forecasts():
+    flat = pd.DataFrame({"Date": pd.bdate_range("2024-01-01", periods=100), "Close": 42.0})
+    for name in MODELS:
+        np.testing.assert_allclose(predict_stock(flat, days=3, model=name)["Predicted_Close"], 42.0)
+
+
+def test_return_models_find_autocorrelation():
+    rng = np.random.default_rng(1)
+    returns = np.zeros(3000)
+    for t in range(1, 3000):
+        returns[t] = 0.6 * returns[t - 1] + rng.normal(0, 0.01)
+    closes = 100 * np.exp(np.cumsum(returns))
+
+    ar = AutoRegressive.fit(np.arange(3000), closes)
+    assert ar.coef[0] == pytest.approx(0.6, abs=0.05)
+    assert np.abs(ar.coef[1:]).max() < 0.1
+    ridge = LaggedReturnRidge.fit(np.arange(3000), closes)
+    # Lags run oldest to newest, so the last coefficient is lag 1; the penalty shrinks it
+    assert ridge.coef[-1] == np.abs(ridge.coef).max()
+    assert 0.1 < ridge.coef[-1] < 0.6
+
+
+def test_benchmark_reports_every_model():
+    bench = benchmark_models(synthetic_closes(tickers=3, bars=300), window=120, profiled=1)
+    assert list(bench["Model"]) == list(BACKTEST_MODELS)
+    assert (bench["Fits"] == 3).all()
+    assert (bench["Fit_ms"] > 0).all() and (bench["Peak_KiB"] > 0).all() and (bench["State_bytes"] > 0).all()
@@ -1,10 +1,33 @@
-import yfinance as yf
+"""
+Tests for price prediction on provider data (prediction.linear_regression)
+"""
+
+import numpy as np
+import pandas as pd
+
+from market_data.providers import MarketDataProvider, get_provider, set_provider
 from prediction.linear_regression import predict_stock
 
-# Download last 6 months of Apple stock data
-data = yf.download("AAPL", period="6mo")
-data.reset_index(inplace=True)
 
-# Run prediction
-preds = predict_stock(data, days=5)
-print(preds)
+class TrendingProvider(MarketDataProvider):
+    """Offline stand-in for yfinance: six months of daily bars rising by 1.0 a day."""
+
+    def history(self, ticker, period=None, interval="1d", start=None):
+        index = pd.bdate_range(end="2025-06-30", periods=126, name="Date")
+        close = 100.0 + np.arange(len(index))
+        return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                             "Volume": 1_000_000}, index=index)
+
+
+def test_predict_stock_on_provider_history():
+    set_provider(TrendingProvider())
+    try:
+        data = get_provider().history("AAPL", period="6mo")
+    finally:
+        set_provider(None)
+    data.reset_index(inplace=True)
+
+    preds = predict_stock(data, days=5)
+    assert list(preds.columns) == ["Date", "Predicted_Close"]
+    assert list(preds["Date"]) == list(pd.date_range("2025-07-01", periods=5))
+    np.testing.assert_allclose(preds["Predicted_Close"], 226.0 + np.arange(5))
@@ -0,0 +1,55 @@
+"""
+Tests for the concurrent dashboard prefetch (market_data.prefetch)
+"""
+
+import dataclasses
+import time
+
+import pandas as pd
+import pytest
+
+from market_data.prefetch import prefetch_dashboard
+from market_data.snapshot import TickerSnapshot
+
+
+def slow(value, delay=0.2):
+    def fetch():
+        time.sleep(delay)
+        return value
+    return fetch
+
+
+def test_fetches_run_concurrently_into_frozen_bundle():
+    history = pd.DataFrame({"Close": [1.0, 2.0]})
+    warmed = []
+    fetchers = {
+        "history": slow(history),
+        # A warm-up fetch: it runs with the others but is not a bundle field
+        "intraday": lambda: warmed.append(slow(None)()),
+        "prediction_history": slow(history),
+        "snapshot": slow(TickerSnapshot.from_info("AAPL", {"longName": "Apple Inc."})),
+        "news": slow([{"title": "headline"}]),
+    }
+
+    start = time.perf_counter()
+    bundle = prefetch_dashboard("AAPL", "1y", fetchers)
+    assert time.perf_counter() - start < 0.6
+
+    assert bundle.snapshot.long_name == "Apple Inc."
+    assert warmed == [None] and not hasattr(bundle, "intraday")
+    assert bundle.news == ({"title": "headline"},)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        bundle.history = pd.DataFrame()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        bundle.snapshot.long_name = "changed"
+
+
+def test_failed_fetch_is_reported_not_raised():
+    def broken():
+        raise ConnectionError("offline")
+
+    bundle = prefetch_dashboard("AAPL", "1y", {"history": broken, "news": lambda: [{"title": "headline"}]})
+    assert bundle.errors["history"] == "offline"
+    assert bundle.history.empty
+    assert bundle.snapshot == TickerSnapshot(symbol="AAPL")
+    assert len(bundle.news) == 1
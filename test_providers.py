@@ -0,0 +1,52 @@
+"""
+Tests for the market data provider layer (market_data.providers)
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+from market_data.providers import MarketDataProvider, RecordingNotFound, RecordReplayProvider
+
+
+class FakeUpstream(MarketDataProvider):
+    def __init__(self):
+        self.calls = 0
+
+    def history(self, ticker, period=None, interval="1d", start=None):
+        self.calls += 1
+        index = pd.bdate_range("2024-01-01", periods=5)
+        return pd.DataFrame({"Close": range(5)}, index=index)
+
+    def info(self, ticker):
+        self.calls += 1
+        return {"symbol": ticker, "longName": f"{ticker} Corp"}
+
+
+def test_record_then_replay_offline(tmp_path):
+    upstream = FakeUpstream()
+    recorder = RecordReplayProvider(str(tmp_path), mode="record", upstream=upstream)
+    recorded = recorder.history("AAPL", period="1y")
+    recorder.info("AAPL")
+
+    replay = RecordReplayProvider(str(tmp_path))
+    pd.testing.assert_frame_equal(replay.history("AAPL", period="1y"), recorded)
+    assert replay.info("AAPL")["longName"] == "AAPL Corp"
+    assert upstream.calls == 2
+
+
+def test_replay_missing_recordings(tmp_path):
+    replay = RecordReplayProvider(str(tmp_path))
+    with pytest.raises(RecordingNotFound):
+        replay.info("MSFT")
+    # Unrecorded incremental fetches replay as "no new bars"
+    assert replay.history("MSFT", start="2024-01-05").empty
+
+
+def test_replay_latency_injection(tmp_path):
+    RecordReplayProvider(str(tmp_path), mode="record", upstream=FakeUpstream()).info("AAPL")
+    replay = RecordReplayProvider(str(tmp_path), latency=0.05)
+    start = time.perf_counter()
+    replay.info("AAPL")
+    assert time.perf_counter() - start >= 0.05
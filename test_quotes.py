@@ -0,0 +1,27 @@
+"""
+Tests for batched watchlist quotes (market_data.quotes)
+"""
+
+import pandas as pd
+
+from market_data.cache import MarketDataCache
+from market_data.quotes import QuoteCache
+
+
+def test_stale_tickers_are_fetched_in_one_batch():
+    calls = []
+
+    def download(tickers):
+        calls.append(list(tickers))
+        return pd.DataFrame({t: [100.0, 110.0] for t in tickers if t != "BAD"})
+
+    cache = QuoteCache(download=download, cache=MarketDataCache())
+    quotes = cache.get_quotes(["aapl", "MSFT", "BAD"])
+
+    assert calls == [["AAPL", "MSFT", "BAD"]]
+    assert quotes["AAPL"]["price"] == 110.0
+    assert round(quotes["MSFT"]["pctchg"], 6) == 10.0
+    assert quotes["BAD"]["price"] is None
+
+    cache.get_quotes(["AAPL", "MSFT", "NVDA"])
+    assert calls[-1] == ["NVDA"]
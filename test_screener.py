@@ -0,0 +1,63 @@
+"""
+Tests for the technical screener (indicators.screener)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.screener import ScreenSyntaxError, parse_condition, read_symbol_list, run_screen
+from indicators.technical import calculate_technical_indicators
+
+
+@pytest.fixture
+def store(make_bars, random_closes, fake_store):
+    volume = np.full(260, 1000.0)
+    volume[-1] = 5000.0
+    return fake_store({
+        "UP": make_bars(np.linspace(50, 150, 260), volume=volume),
+        "DOWN": make_bars(np.linspace(150, 50, 260)),
+        "NOISE": make_bars(random_closes(260, seed=3)),
+    })
+
+
+def test_conditions_match_pandas_indicators(store):
+    result = run_screen("RSI < 30", ["UP", "DOWN", "NOISE", "MISSING"], store=store, workers=0)
+    expected = [t for t in ["UP", "DOWN", "NOISE"]
+                if calculate_technical_indicators(store.frames[t])["RSI"].iloc[-1] < 30]
+    assert sorted(result.index) == sorted(expected)
+
+    result = run_screen("close > sma_200 * 1.1 and Volume_Ratio > 2", ["UP", "DOWN", "NOISE"], store=store, workers=0)
+    assert list(result.index) == ["UP"]
+
+
+def test_crosses_above_uses_the_previous_bar(make_bars, fake_store):
+    close = np.r_[np.linspace(100, 80, 60), [90.0]]
+    store = fake_store({"X": make_bars(close), "Y": make_bars(np.linspace(80, 100, 61))})
+    data = calculate_technical_indicators(store.frames["X"])
+    assert data["Close"].iloc[-2] < data["SMA_20"].iloc[-2] and data["Close"].iloc[-1] > data["SMA_20"].iloc[-1]
+
+    assert list(run_screen("Close crosses above SMA_20", ["X", "Y"], store=store, workers=0).index) == ["X"]
+    assert run_screen("Close crosses_below SMA_20", ["X", "Y"], store=store, workers=0).empty
+
+
+def test_process_pool_chunks_match_in_process(store):
+    tickers = ["UP", "DOWN", "NOISE"]
+    condition = "(RSI < 30 or RSI > 70) and not %K > 101"
+    serial = run_screen(condition, tickers, store=store, workers=0)
+    pooled = run_screen(condition, tickers, store=store, chunk_size=1, workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_invalid_conditions_and_symbol_lists():
+    for bad in ["", "RSI <", "RSI < 30 and", "FOO > 1", "RSI 30"]:
+        with pytest.raises(ScreenSyntaxError):
+            parse_condition(bad)
+    assert read_symbol_list("Symbol\naapl, msft\nBRK-B ; ^GSPC\naapl\n") == ["AAPL", "MSFT", "BRK-B", "^GSPC"]
+    table = 'Name,Ticker,Sector\n"Apple Inc.",aapl,Information Technology\nAlphabet Class A,GOOGL,Communication\n'
+    assert read_symbol_list(table, "universe.csv") == ["AAPL", "GOOGL"]
+    assert read_symbol_list("AAPL,Apple Inc.\nMSFT,Microsoft Corp\n", "list.CSV") == ["AAPL", "MSFT"]
+    bundled = pd.read_csv(os.path.join(os.path.dirname(__file__), "market_data", "symbols.csv"))
+    assert read_symbol_list(bundled.to_csv(index=False), "symbols.csv") == list(dict.fromkeys(bundled["symbol"]))
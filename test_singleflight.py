@@ -0,0 +1,43 @@
+"""
+Tests for single-flight request coalescing (market_data.singleflight)
+"""
+
+import threading
+import time
+
+import pytest
+
+from market_data.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_fetch():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"price": 123}
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do(("AAPL", "info", ()), fetch)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"price": 123}] * 8
+    assert flight.stats() == {"fetches": 1, "shared": 7, "in_flight": 0}
+
+
+def test_errors_propagate_and_do_not_stick():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("key", boom)
+    assert flight.do("key", lambda: 1) == 1
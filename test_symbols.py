@@ -0,0 +1,32 @@
+"""
+Tests for the local ticker search index (market_data.symbols)
+"""
+
+from market_data.symbols import SymbolIndex, get_symbol_index
+
+
+def test_prefix_and_fuzzy_matches():
+    index = SymbolIndex([
+        ("MSFT", "Microsoft Corporation", "NMS"),
+        ("MU", "Micron Technology, Inc.", "NMS"),
+        ("NVDA", "NVIDIA Corporation", "NMS"),
+        ("KO", "The Coca-Cola Company", "NYQ"),
+    ])
+    assert index.search("MSFT")[0][0] == "MSFT"
+    assert {s for s, _, _ in index.search("micro")} == {"MSFT", "MU"}
+    assert index.search("coca cola")[0][0] == "KO"
+    assert index.search("nvidea")[0][0] == "NVDA"
+    assert index.search("zzzz") == []
+
+
+def test_learned_symbols_become_searchable():
+    index = SymbolIndex()
+    index.add("RDDT", "Reddit, Inc.", "NYQ")
+    assert index.search("redd") == [("RDDT", "Reddit, Inc.", "NYQ")]
+
+
+def test_bundled_index_covers_important_stocks():
+    index = get_symbol_index()
+    for symbol in ["AAPL", "MSFT", "GOOGL", "JPM", "MCD"]:
+        assert index.search(symbol)[0][0] == symbol
+    assert index.sector("XOM") == "Energy"
@@ -1,14 +1,13 @@
-import yfinance as yf
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 from prediction.linear_regression import predict_stock
+from market_data.providers import get_provider
 
 
 def get_stock_info(ticker):
-    stock = yf.Ticker(ticker)
-    return stock
+    return get_provider().info(ticker)
 
 def main():
     st.title("Stock Market Information App")
@@ -19,8 +18,8 @@ def main():
     # This is the main block. All code that needs the 'ticker' must be inside it.
     if ticker:
         try:
-            stock = get_stock_info(ticker)
-            info = stock.info
+            provider = get_provider()
+            info = get_stock_info(ticker)
 
             # Summary (check if company name exists to validate ticker)
             st.header("Summary")
@@ -31,7 +30,7 @@ def main():
 
             # Chart - This 'data' variable is used for prediction later
             st.header("Chart")
-            data = stock.history(period="1y")
+            data = provider.history(ticker, period="1y")
             fig = go.Figure(data=[go.Candlestick(x=data.index,
                                                  open=data['Open'],
                                                  high=data['High'],
@@ -49,24 +48,24 @@ def main():
 
             # Historical Data
             st.header("Historical Data")
-            hist_data = stock.history(period="1mo")
+            hist_data = provider.history(ticker, period="1mo")
             st.dataframe(hist_data)
 
             # Financial Statements
             st.header("Financial Statements")
             st.subheader("Balance Sheet")
-            balance_sheet = stock.balance_sheet
+            balance_sheet = provider.statement(ticker, "balance_sheet")
             st.dataframe(balance_sheet)
             st.subheader("Income Statement")
-            income_stmt = stock.financials
+            income_stmt = provider.statement(ticker, "financials")
             st.dataframe(income_stmt)
             st.subheader("Cash Flow")
-            cash_flow = stock.cashflow
+            cash_flow = provider.statement(ticker, "cashflow")
             st.dataframe(cash_flow)
 
             # News
             st.header("Recent News")
-            news = stock.news
+            news = provider.news(ticker)
             for item in news[:5]:
                 st.write(f"**{item['title']}**")
                 st.write(item['link'])
@@ -1,4 +1,3 @@
-import yfinance as yf
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
@@ -6,11 +5,31 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import time
+import threading
 import numpy as np
-import requests
 import plotly.io as pio
-from tr import predict_stock
 import matplotlib.pyplot as plt
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from charts.cache import figure_cache, frame_key, indicator_cache, themed
+from charts.downsample import resample_mean, resample_ohlc
+from charts.traces import compact_dates, line_trace, values
+from indicators.screener import (
+    RESULT_COLUMNS as SCREEN_RESULT_COLUMNS, FIELDS as SCREEN_FIELDS, ScreenSyntaxError, read_symbol_list, run_screen
+)
+from indicators.technical import calculate_technical_indicators
+from market_data.bar_store import bar_panel, bar_store
+from market_data.cache import DEFAULT_TTLS, market_cache
+from market_data.heatmap import HORIZONS as HEATMAP_HORIZONS, heatmap_engine, sector_summary
+from market_data.http import upstream
+from market_data.intraday import intraday_stream
+from market_data.prefetch import prefetch_dashboard
+from market_data.providers import get_provider
+from market_data.quotes import quote_cache
+from market_data.singleflight import market_flight
+from market_data.snapshot import TickerSnapshot
+from market_data.symbols import get_symbol_index
+from prediction.forecast_store import forecast_store
+from prediction.models import MODEL_LABELS
 
 
 IMPORTANT_STOCKS = [
@@ -256,35 +275,31 @@ _dark_css = """
 # Company Name/Ticker Search (Autocomplete Feature)
 # ==========================
 
-@st.cache_data(ttl=3600)
 def fetch_ticker_suggestions(query, max_results=5):
     """
-    Fetch matching tickers and company names using Yahoo Finance autocompletion API.
+    Fetch matching tickers and company names from the local symbol index,
+    falling back to the market data provider's search for unknown names.
     Returns a list of tuples: (symbol, name, exchange)
     """
     if not query or len(query) < 2:
         return []  
 
-    url = (
-        f"https://query2.finance.yahoo.com/v1/finance/search"
-        f"?q={query}&quotesCount={max_results}&newsCount=0&lang=en"
-    )
+    index = get_symbol_index()
+    suggestions = index.search(query, max_results=max_results)
+    if suggestions:
+        return suggestions
+
     try:
-        resp = requests.get(url, timeout=2)
-        if resp.status_code != 200:
-            return []
-        data = resp.json()
-        suggestions = []
-        for item in data.get("quotes", []):
-            symbol = item.get("symbol")
-            name = item.get("shortname") or item.get("longname") or ""
-            exch = item.get("exchange", "")
-            # Filter out cryptocurrencies and funds for relevance
-            if item.get("quoteType") in ("EQUITY", "ETF"):
-                suggestions.append((symbol, name, exch))
-        return suggestions[:max_results]
+        suggestions = market_cache.fetch(
+            "search", query, lambda: get_provider().search(query, max_results=max_results),
+            params=(max_results,)
+        )
     except Exception:
         return []
+    # Remember remote hits so the next lookup for them stays local
+    for symbol, name, exch in suggestions:
+        index.add(symbol, name, exch)
+    return suggestions
 
 def ticker_autocomplete_input(label, key, default="AAPL", help=None):
     """
@@ -340,29 +355,14 @@ def remove_from_watchlist(ticker):
         st.session_state["watchlist"] = watchlist
 
 def display_watchlist(selected_ticker_callback=None):
-    st.sidebar.markdown("## 📋 My Watchlist")
+    """Watchlist with live quotes; call inside `with st.sidebar:` so it can run as a fragment"""
+    st.markdown("## 📋 My Watchlist")
     watchlist = get_watchlist()
     if not watchlist:
-        st.sidebar.info("Your watchlist is empty. Add stocks to track them here!")
+        st.info("Your watchlist is empty. Add stocks to track them here!")
         return
-    tickers_data = {}
-    for ticker in watchlist:
-        try:
-            stock = yf.Ticker(ticker)
-            price = stock.info.get("regularMarketPrice", None)
-            prev = stock.info.get("regularMarketPreviousClose", None)
-            daychg = None
-            pctchg = None
-            if price is not None and prev is not None and prev != 0:
-                daychg = price - prev
-                pctchg = (daychg / prev) * 100
-            tickers_data[ticker] = {
-                "price": price,
-                "daychg": daychg,
-                "pctchg": pctchg
-            }
-        except Exception:
-            tickers_data[ticker] = {"price": None, "daychg": None, "pctchg": None}
+    # One batched download for every stale ticker instead of two info lookups per ticker
+    tickers_data = quote_cache.get_quotes(watchlist)
     for ticker in watchlist:
         data = tickers_data[ticker]
         label = f"**{ticker}**"
@@ -373,13 +373,15 @@ def display_watchlist(selected_ticker_callback=None):
                 label += f"{emoji} {data['daychg']:+.2f} ({data['pctchg']:+.2f}%)"
         else:
             label += " -"
-        cols = st.sidebar.columns([0.7, 0.15, 0.15])
+        cols = st.columns([0.7, 0.15, 0.15])
         with cols[0]:
             if st.button(label, key=f"goto_{ticker}"):
                 if selected_ticker_callback:
                     selected_ticker_callback(ticker)
                 else:
                     st.session_state["selected_ticker"] = ticker
+                # A click inside a fragment only reruns the fragment; the dashboard must switch ticker
+                st.rerun()
         with cols[1]:
             st.markdown("")
         with cols[2]:
@@ -402,80 +404,51 @@ st.set_page_config(
 )
 
 
-@st.cache_resource(ttl=300)  # Cache for 5 minutes
-def get_stock_info(ticker):
-    """Get comprehensive stock information"""
+def get_ticker_news(ticker):
+    """Get recent news items for a ticker"""
+    try:
+        return market_cache.fetch("news", ticker, lambda: get_provider().news(ticker))
+    except Exception as e:
+        st.error(f"Error fetching news: {e}")
+        return []
+
+def get_ticker_snapshot(ticker):
+    """Get the dashboard's company info fields from a single info lookup shared across sessions"""
     try:
-        stock = yf.Ticker(ticker)
-        return stock
+        return market_cache.fetch(
+            "info", ticker, lambda: TickerSnapshot.from_info(ticker, get_provider().info(ticker))
+        )
     except Exception as e:
-        st.error(f"Error fetching stock data: {e}")
-        return None
+        st.error(f"Error fetching stock info: {e}")
+        return TickerSnapshot(symbol=ticker)
 
-@st.cache_data(ttl=60)  # Cache for 1 minute for real-time feel
 def get_real_time_data(ticker):
     """Get real-time stock data"""
     try:
-        stock = yf.Ticker(ticker)
-        # Get intraday data for real-time feel
-        data = stock.history(period="1d", interval="1m")
-        return data
+        # Only bars newer than the ones already buffered are fetched
+        return intraday_stream.get(ticker)
     except Exception as e:
         st.error(f"Error fetching real-time data: {e}")
         return pd.DataFrame()
 
-def calculate_technical_indicators(data):
-    """Calculate comprehensive technical indicators"""
-    if data.empty:
-        return data
-    
-    # Simple Moving Averages
-    data['SMA_20'] = data['Close'].rolling(window=20).mean()
-    data['SMA_50'] = data['Close'].rolling(window=50).mean()
-    data['SMA_200'] = data['Close'].rolling(window=200).mean()
-    
-    # Exponential Moving Averages
-    data['EMA_12'] = data['Close'].ewm(span=12).mean()
-    data['EMA_26'] = data['Close'].ewm(span=26).mean()
-    data['EMA_50'] = data['Close'].ewm(span=50).mean()
-    
-    # RSI
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    data['RSI'] = 100 - (100 / (1 + rs))
-    
-    # MACD
-    data['MACD'] = data['EMA_12'] - data['EMA_26']
-    data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
-    data['MACD_Histogram'] = data['MACD'] - data['MACD_Signal']
-    
-    # Bollinger Bands
-    data['BB_Middle'] = data['Close'].rolling(window=20).mean()
-    bb_std = data['Close'].rolling(window=20).std()
-    data['BB_Upper'] = data['BB_Middle'] + (bb_std * 2)
-    data['BB_Lower'] = data['BB_Middle'] - (bb_std * 2)
-    
-    # Stochastic Oscillator
-    low_14 = data['Low'].rolling(window=14).min()
-    high_14 = data['High'].rolling(window=14).max()
-    data['%K'] = 100 * ((data['Close'] - low_14) / (high_14 - low_14))
-    data['%D'] = data['%K'].rolling(window=3).mean()
-    
-    # Average True Range (ATR)
-    data['H-L'] = data['High'] - data['Low']
-    data['H-PC'] = abs(data['High'] - data['Close'].shift(1))
-    data['L-PC'] = abs(data['Low'] - data['Close'].shift(1))
-    data['TR'] = data[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-    data['ATR'] = data['TR'].rolling(window=14).mean()
-    
-    return data
+# Indicator columns each dashboard section displays, so a render only computes what it shows
+CANDLESTICK_INDICATORS = ("SMA_20", "SMA_50")
+TECHNICAL_CHART_INDICATORS = (
+    "RSI", "MACD", "MACD_Signal", "MACD_Histogram", "%K", "%D", "BB_Upper", "BB_Middle", "BB_Lower"
+)
+TECHNICAL_SUMMARY_INDICATORS = ("RSI", "MACD", "MACD_Signal", "ATR")
+
+# Points drawn per trace for each chart detail level; None draws every bar
+CHART_POINT_BUDGETS = {"Auto": 800, "High": 2000, "Full resolution": None}
 
-def create_advanced_candlestick_chart(data, title="Stock Price"):
+def create_advanced_candlestick_chart(data, title="Stock Price", max_points=None):
     """Create advanced candlestick chart with volume"""
     if data.empty:
         return go.Figure()
+
+    # Candles are re-aggregated into wider bars; the moving averages keep their shape via LTTB
+    candles = resample_ohlc(data, max_points)
+    candle_x = compact_dates(candles.index)
     
     # Create subplots
     fig = make_subplots(
@@ -489,11 +462,11 @@ def create_advanced_candlestick_chart(data, title="Stock Price"):
     # Candlestick chart
     fig.add_trace(
         go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
+            x=candle_x,
+            open=values(candles['Open']),
+            high=values(candles['High']),
+            low=values(candles['Low']),
+            close=values(candles['Close']),
             name="OHLC",
             increasing_line_color='#00C851',
             decreasing_line_color='#ff4444'
@@ -505,9 +478,9 @@ def create_advanced_candlestick_chart(data, title="Stock Price"):
     # Add moving averages if available
     if 'SMA_20' in data.columns:
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
-                y=data['SMA_20'],
+            line_trace(
+                data['SMA_20'],
+                max_points,
                 mode='lines',
                 name='SMA 20',
                 line=dict(color='orange', width=1)
@@ -517,9 +490,9 @@ def create_advanced_candlestick_chart(data, title="Stock Price"):
     
     if 'SMA_50' in data.columns:
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
-                y=data['SMA_50'],
+            line_trace(
+                data['SMA_50'],
+                max_points,
                 mode='lines',
                 name='SMA 50',
                 line=dict(color='blue', width=1)
@@ -528,13 +501,12 @@ def create_advanced_candlestick_chart(data, title="Stock Price"):
         )
     
     # Volume chart
-    colors = ['red' if close < open else 'green' 
-              for close, open in zip(data['Close'], data['Open'])]
+    colors = np.where(candles['Close'] < candles['Open'], 'red', 'green')
     
     fig.add_trace(
         go.Bar(
-            x=data.index,
-            y=data['Volume'],
+            x=candle_x,
+            y=values(candles['Volume']),
             name='Volume',
             marker_color=colors,
             opacity=0.7
@@ -556,7 +528,49 @@ def create_advanced_candlestick_chart(data, title="Stock Price"):
     
     return fig
 
-def create_technical_indicators_chart(data):
+def append_candlestick_bars(fig, bars, max_points=None):
+    """Push new bars into a chart from create_advanced_candlestick_chart, replacing any it already shows"""
+    if bars.empty:
+        return fig
+    colors = np.where(bars['Close'] < bars['Open'], 'red', 'green')
+    new_x = compact_dates(bars.index)
+    with fig.batch_update():
+        for trace in fig.data:
+            if trace.type not in ('candlestick', 'bar'):
+                continue
+            # Bars at or after the first new timestamp are re-sent upstream while still forming;
+            # compact date strings sort chronologically, so they can be searched directly
+            keep = np.asarray(trace.x).searchsorted(new_x[0])
+            drop = max(0, keep + len(bars) - max_points) if max_points else 0
+            # Arrays stay NumPy so the figure keeps shipping them as typed arrays
+            trace.x = np.concatenate([np.asarray(trace.x)[drop:keep], new_x])
+            if trace.type == 'candlestick':
+                for field in ('open', 'high', 'low', 'close'):
+                    shown = np.asarray(getattr(trace, field))[drop:keep]
+                    setattr(trace, field, np.concatenate([shown, values(bars[field.capitalize()])]))
+            else:
+                trace.y = np.concatenate([np.asarray(trace.y)[drop:keep], values(bars['Volume'])])
+                trace.marker.color = np.concatenate([np.asarray(trace.marker.color)[drop:keep], colors])
+    return fig
+
+def streaming_intraday_chart(ticker, data):
+    """Reuse this session's intraday chart, pushing only the bars it has not drawn yet; render it with show_chart"""
+    state_key = f"intraday_chart_{ticker}"
+    cached = st.session_state.get(state_key)
+    if cached is not None:
+        fig, last_bar = cached
+        if last_bar.normalize() == data.index[-1].normalize():
+            append_candlestick_bars(fig, data[data.index >= last_bar], max_points=len(data))
+            st.session_state[state_key] = (fig, data.index[-1])
+            return fig
+
+    fig = create_advanced_candlestick_chart(data, f"{ticker} - Intraday (1-minute intervals)")
+    # Keep the user's zoom and pan across refreshes
+    fig.update_layout(uirevision=ticker)
+    st.session_state[state_key] = (fig, data.index[-1])
+    return fig
+
+def create_technical_indicators_chart(data, max_points=None):
     """Create comprehensive technical indicators chart"""
     if data.empty or 'RSI' not in data.columns:
         return go.Figure()
@@ -572,7 +586,7 @@ def create_technical_indicators_chart(data):
     
     # RSI
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['RSI'], name='RSI', line=dict(color='purple')),
+        line_trace(data['RSI'], max_points, name='RSI', line=dict(color='purple')),
         row=1, col=1
     )
     
@@ -582,26 +596,27 @@ def create_technical_indicators_chart(data):
     
     # MACD
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['MACD'], name='MACD', line=dict(color='blue')),
+        line_trace(data['MACD'], max_points, name='MACD', line=dict(color='blue')),
         row=2, col=1
     )
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['MACD_Signal'], name='Signal', line=dict(color='red')),
+        line_trace(data['MACD_Signal'], max_points, name='Signal', line=dict(color='red')),
         row=2, col=1
     )
+    histogram = resample_mean(data['MACD_Histogram'], max_points)
     fig.add_trace(
-        go.Bar(x=data.index, y=data['MACD_Histogram'], name='Histogram', opacity=0.7),
+        go.Bar(x=compact_dates(histogram.index), y=values(histogram), name='Histogram', opacity=0.7),
         row=2, col=1
     )
     
     # Stochastic Oscillator
     if '%K' in data.columns:
         fig.add_trace(
-            go.Scatter(x=data.index, y=data['%K'], name='%K', line=dict(color='blue')),
+            line_trace(data['%K'], max_points, name='%K', line=dict(color='blue')),
             row=3, col=1
         )
         fig.add_trace(
-            go.Scatter(x=data.index, y=data['%D'], name='%D', line=dict(color='red')),
+            line_trace(data['%D'], max_points, name='%D', line=dict(color='red')),
             row=3, col=1
         )
         fig.add_hline(y=80, line_dash="dash", line_color="red", row=3, col=1)
@@ -609,19 +624,19 @@ def create_technical_indicators_chart(data):
     
     # Bollinger Bands with Price
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['BB_Upper'], name='BB Upper', line=dict(color='red', dash='dash')),
+        line_trace(data['BB_Upper'], max_points, name='BB Upper', line=dict(color='red', dash='dash')),
         row=4, col=1
     )
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['BB_Middle'], name='BB Middle', line=dict(color='orange')),
+        line_trace(data['BB_Middle'], max_points, name='BB Middle', line=dict(color='orange')),
         row=4, col=1
     )
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['BB_Lower'], name='BB Lower', line=dict(color='red', dash='dash')),
+        line_trace(data['BB_Lower'], max_points, name='BB Lower', line=dict(color='red', dash='dash')),
         row=4, col=1
     )
     fig.add_trace(
-        go.Scatter(x=data.index, y=data['Close'], name='Close Price'),
+        line_trace(data['Close'], max_points, name='Close Price'),
         row=4, col=1
     )
     
@@ -639,7 +654,7 @@ def create_technical_indicators_chart(data):
     
     return fig
 
-def create_volume_analysis_chart(data):
+def create_volume_analysis_chart(data, max_points=None):
     """Create advanced volume analysis chart"""
     if data.empty:
         return go.Figure()
@@ -665,24 +680,25 @@ def create_volume_analysis_chart(data):
         row_heights=[0.6, 0.4]
     )
     
-    # Volume bars
-    colors = ['red' if close < open else 'green' 
-              for close, open in zip(volume_data['Close'], volume_data['Open'])]
+    # Volume bars, summed per bucket when the range is wider than the point budget
+    bars = resample_ohlc(volume_data, max_points)
+    colors = np.where(bars['Close'] < bars['Open'], 'red', 'green')
     
     fig.add_trace(
-        go.Bar(x=volume_data.index, y=volume_data['Volume'], name='Volume', marker_color=colors, opacity=0.7),
+        go.Bar(x=compact_dates(bars.index), y=values(bars['Volume']), name='Volume', marker_color=colors,
+               opacity=0.7),
         row=1, col=1
     )
     
     fig.add_trace(
-        go.Scatter(x=volume_data.index, y=volume_data['Volume_SMA'], name='Volume SMA(20)', 
+        line_trace(volume_data['Volume_SMA'], max_points, name='Volume SMA(20)', 
                   line=dict(color='blue', width=2)),
         row=1, col=1
     )
     
     # Volume ratio
     fig.add_trace(
-        go.Scatter(x=volume_data.index, y=volume_data['Volume_Ratio'], name='Volume Ratio', 
+        line_trace(volume_data['Volume_Ratio'], max_points, name='Volume Ratio', 
                   line=dict(color='purple')),
         row=2, col=1
     )
@@ -698,13 +714,39 @@ def create_volume_analysis_chart(data):
     
     return fig
 
-def display_real_time_metrics(stock_info, current_data):
+def live_fragment(fn, refresh_seconds, enabled):
+    """
+    Wrap `fn` as a Streamlit fragment.
+
+    While `enabled` (auto refresh is on) the fragment reruns by itself every
+    `refresh_seconds`, redrawing only its own elements instead of the whole
+    app; otherwise it behaves like a plain call.
+    """
+    return st.fragment(fn, run_every=refresh_seconds if enabled else None)
+
+def live_metrics(ticker, snapshot, fallback):
+    """Real-time metrics row, from the intraday bars or `fallback` when there are none"""
+    real_time_data = get_real_time_data(ticker)
+    if not real_time_data.empty:
+        display_real_time_metrics(snapshot, real_time_data)
+    else:
+        st.warning("Real-time data not available, showing latest market data")
+        display_real_time_metrics(snapshot, fallback)
+
+def live_intraday_chart(ticker):
+    """Today's intraday chart, pushing only new bars into this session's figure"""
+    real_time_data = get_real_time_data(ticker)
+    if not real_time_data.empty:
+        intraday_chart = streaming_intraday_chart(ticker, real_time_data)
+        show_chart(intraday_chart, key=f"chart_{ticker}_intraday")
+
+def display_real_time_metrics(snapshot, current_data):
     """Display real-time metrics in an attractive format"""
     if current_data.empty:
         return
     
     current_price = current_data['Close'].iloc[-1]
-    prev_close = stock_info.info.get('regularMarketPreviousClose', current_price)
+    prev_close = snapshot.previous_close if snapshot.previous_close is not None else current_price
     change = current_price - prev_close
     change_pct = (change / prev_close) * 100 if prev_close != 0 else 0
     
@@ -739,7 +781,7 @@ def display_real_time_metrics(stock_info, current_data):
     
     with col3:
         total_volume = current_data['Volume'].sum()
-        avg_volume = stock_info.info.get('averageVolume', 0)
+        avg_volume = snapshot.average_volume or 0
         volume_ratio = total_volume / avg_volume if avg_volume > 0 else 0
         st.markdown(f"""
         <div class="metric-container">
@@ -751,8 +793,8 @@ def display_real_time_metrics(stock_info, current_data):
         """, unsafe_allow_html=True)
     
     with col4:
-        market_cap = stock_info.info.get('marketCap', 0)
-        pe_ratio = stock_info.info.get('trailingPE', 'N/A')
+        market_cap = snapshot.market_cap or 0
+        pe_ratio = snapshot.trailing_pe if snapshot.trailing_pe is not None else 'N/A'
         
         # Format market cap safely
         if isinstance(market_cap, (int, float)) and market_cap > 0:
@@ -776,53 +818,115 @@ def display_real_time_metrics(stock_info, current_data):
         </div>
         """, unsafe_allow_html=True)
 
-def stock_heatmap_chart(tickers):
-    data = yf.download(tickers, period="5d")['Close']
-    pct_change = data.pct_change().iloc[-1] * 100
-
-    heatmap_df = pd.DataFrame({
-        'Stock': pct_change.index,
-        'Change (%)': pct_change.values
-    })
-
-    fig = px.imshow(
-        [heatmap_df['Change (%)'].values],
-        labels=dict(x="Stock", y="", color="Change (%)"),
-        x=heatmap_df['Stock'],
-        y=["Performance"],
-        color_continuous_scale='RdYlGn'
+def stock_heatmap_chart(table, horizon="1D"):
+    """Sector treemap sized by dollar volume and coloured by the return over `horizon`"""
+    heatmap_df = table.dropna(subset=[horizon]).reset_index(names="Stock")
+    bound = max(float(heatmap_df[horizon].abs().quantile(0.95)), 0.5) if not heatmap_df.empty else 1.0
+
+    fig = px.treemap(
+        heatmap_df,
+        path=[px.Constant("Market"), "Sector", "Stock"],
+        values="Weight",
+        color=horizon,
+        color_continuous_scale='RdYlGn',
+        color_continuous_midpoint=0,
+        range_color=(-bound, bound),
+        custom_data=[horizon]
+    )
+    fig.update_traces(
+        texttemplate="%{label}<br>%{customdata[0]:+.2f}%",
+        hovertemplate="%{label}<br>Change: %{color:+.2f}%<extra></extra>"
+    )
+    fig.update_layout(
+        title=f"Stock Market Heatmap ({horizon} change, %)",
+        height=650,
+        margin=dict(t=50, l=10, r=10, b=10)
     )
-    fig.update_layout(title="Stock Market Heatmap")
     return fig
-def render_full_stock_dashboard(ticker, period):
-    stock = get_stock_info(ticker)
-    if not stock:
-        st.error(f"Failed to load data for {ticker}")
+
+def cached_chart(build, data, data_key, *args):
+    """Build a chart once per data content; reruns on unchanged data reuse the cached figure"""
+    return figure_cache.get_or_build(data_key + (build.__name__,) + args, lambda: build(data, *args))
+
+def prefetch_chart(build, data, data_key, *args):
+    """Start building a chart on a background thread so a later cached_chart call finds it ready"""
+    figure_cache.prefetch(data_key + (build.__name__,) + args, lambda: build(data, *args))
+
+def show_chart(fig, key):
+    """Render a shared cached figure with this session's light/dark template"""
+    with themed(fig, pio.templates.default):
+        st.plotly_chart(fig, use_container_width=True, key=key)
+
+def _script_run_ctx_initializer():
+    """Attach the current Streamlit script context to worker threads"""
+    ctx = get_script_run_ctx()
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+def prefetch_dashboard_data(ticker, period):
+    """Fetch everything a dashboard render needs concurrently"""
+    return prefetch_dashboard(ticker, period, {
+        "history": lambda: bar_store.history(ticker, period),
+        # Warm-up only: the live metrics and intraday chart fragments read the bars this buffers
+        "intraday": lambda: get_real_time_data(ticker),
+        "prediction_history": lambda: bar_store.history(ticker, "1y"),
+        "snapshot": lambda: get_ticker_snapshot(ticker),
+        "news": lambda: get_ticker_news(ticker),
+    }, initializer=_script_run_ctx_initializer())
+
+def chart_zoom_range(data, key, max_points):
+    """
+    Let the user narrow the charted date range.
+
+    Charts draw at most `max_points` per trace, so a long history is
+    downsampled; narrowing the range re-renders it from the full-resolution
+    bars. Returns the selected slice of `data` and its (start, end) dates.
+    """
+    first, last = data.index[0].date(), data.index[-1].date()
+    if not max_points or len(data) <= max_points or first == last:
+        return data, (first, last)
+    start, end = st.slider("🔍 Zoom", min_value=first, max_value=last, value=(first, last), key=key)
+    zoomed = data.loc[str(start):str(end)]
+    if zoomed.empty:
+        return data, (first, last)
+    if len(zoomed) <= max_points:
+        st.caption(f"Showing {len(zoomed)} of {len(data)} bars at full resolution")
+    else:
+        st.caption(f"Showing {len(zoomed)} bars downsampled to {max_points} points; narrow the range for full detail")
+    return zoomed, (start, end)
+
+def render_full_stock_dashboard(ticker, period, max_points=None, live=False):
+    # Issue every independent fetch before drawing, so latency is the slowest fetch rather than the sum
+    bundle = prefetch_dashboard_data(ticker, period)
+    if "history" in bundle.errors:
+        st.error(f"Failed to load data for {ticker}: {bundle.errors['history']}")
         return
-    
-    historical_data = stock.history(period=period)
+
+    historical_data = bundle.history.copy()
     if historical_data.empty:
         st.error("No data available for this ticker")
         return
 
-    historical_data = calculate_technical_indicators(historical_data)
-    real_time_data = get_real_time_data(ticker)
-
-    company_name = stock.info.get('longName', ticker)
-    sector = stock.info.get('sector', 'N/A')
+    # Indicators and figures are keyed by bar content, so reruns on unchanged data skip recomputing them
+    bars_key = frame_key(ticker, "1d", historical_data)
+    indicators = CANDLESTICK_INDICATORS + TECHNICAL_CHART_INDICATORS + TECHNICAL_SUMMARY_INDICATORS
+    historical_data = indicator_cache.get_or_build(
+        bars_key + (indicators,), lambda: calculate_technical_indicators(historical_data, indicators)
+    )
+    snapshot = bundle.snapshot
+    company_name = snapshot.long_name or ticker
+    sector = snapshot.sector or 'N/A'
 
     st.subheader(f"📈 {company_name} ({ticker})")
     st.caption(f"Sector: {sector}")
 
+    # The live sections rerun on their own timers; the rest of the page is only redrawn by a full rerun
     st.header("📊 Real-Time Overview")
-    if not real_time_data.empty:
-        display_real_time_metrics(stock, real_time_data)
-    else:
-        st.warning("Real-time data not available, showing latest market data")
-        display_real_time_metrics(stock, historical_data.tail(1))
+    live_fragment(live_metrics, DEFAULT_TTLS["intraday"], live)(ticker, snapshot, historical_data.tail(1))
 
     # Main charts
     st.header("📈 Advanced Charts")
+    chart_data, zoom = chart_zoom_range(historical_data, f"zoom_{ticker}_{period}", max_points)
+    chart_key = bars_key + zoom
     tab_names = [
         "📊 Price & Volume",
         "🔬 Technical Indicators",
@@ -830,116 +934,146 @@ def render_full_stock_dashboard(ticker, period):
         "📋 Financial Overview",
         "🌡️ Market Heatmap"
     ]
-    chart_tabs = st.tabs(tab_names)
+    # Only the open tab's body runs; switching tabs reruns the script with the new tab open
+    chart_tabs = st.tabs(tab_names, key="dashboard_tab", on_change="rerun")
+    chart_builds = [
+        (create_advanced_candlestick_chart, f"{ticker} - Historical ({period})", max_points),
+        (create_technical_indicators_chart, max_points),
+        (create_volume_analysis_chart, max_points),
+    ]
 
     try:
         with chart_tabs[0]:
-            st.subheader("Price Action & Volume")
-            if not real_time_data.empty:
-                intraday_chart = create_advanced_candlestick_chart(
-                    real_time_data, f"{ticker} - Intraday (1-minute intervals)"
-                )
-                st.plotly_chart(intraday_chart, use_container_width=True, key=f"chart_{ticker}_intraday")
-            historical_chart = create_advanced_candlestick_chart(
-                historical_data, f"{ticker} - Historical ({period})"
-            )
-            st.plotly_chart(historical_chart, use_container_width=True, key=f"chart_{ticker}_historical")
+            if chart_tabs[0].open:
+                st.subheader("Price Action & Volume")
+                live_fragment(live_intraday_chart, DEFAULT_TTLS["intraday"], live)(ticker)
+                build, *args = chart_builds[0]
+                historical_chart = cached_chart(build, chart_data, chart_key, *args)
+                show_chart(historical_chart, key=f"chart_{ticker}_historical")
 
 
         with chart_tabs[1]:
-            st.subheader("Technical Indicators Dashboard")
-            tech_chart = create_technical_indicators_chart(historical_data)
-            st.plotly_chart(tech_chart, use_container_width=True, key=f"chart_{ticker}_tech")
-
-            # Technical analysis summary
-            if 'RSI' in historical_data.columns and not historical_data['RSI'].empty:
-                latest_rsi = historical_data['RSI'].iloc[-1]
-                latest_macd = historical_data['MACD'].iloc[-1]
-                latest_signal = historical_data['MACD_Signal'].iloc[-1]
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if not pd.isna(latest_rsi):
-                        rsi_signal = "Overbought" if latest_rsi > 70 else "Oversold" if latest_rsi < 30 else "Neutral"
-                        st.metric("RSI (14)", f"{latest_rsi:.1f}", rsi_signal)
-                    else:
-                        st.metric("RSI (14)", "N/A", "Insufficient data")
-
-                with col2:
-                    if not pd.isna(latest_macd) and not pd.isna(latest_signal):
-                        macd_signal = "Bullish" if latest_macd > latest_signal else "Bearish"
-                        st.metric("MACD Signal", macd_signal, f"{latest_macd - latest_signal:.4f}")
-                    else:
-                        st.metric("MACD Signal", "N/A", "Insufficient data")
+            if chart_tabs[1].open:
+                st.subheader("Technical Indicators Dashboard")
+                build, *args = chart_builds[1]
+                tech_chart = cached_chart(build, chart_data, chart_key, *args)
+                show_chart(tech_chart, key=f"chart_{ticker}_tech")
+
+                # Technical analysis summary
+                if 'RSI' in historical_data.columns and not historical_data['RSI'].empty:
+                    latest_rsi = historical_data['RSI'].iloc[-1]
+                    latest_macd = historical_data['MACD'].iloc[-1]
+                    latest_signal = historical_data['MACD_Signal'].iloc[-1]
+
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        if not pd.isna(latest_rsi):
+                            rsi_signal = "Overbought" if latest_rsi > 70 else "Oversold" if latest_rsi < 30 else "Neutral"
+                            st.metric("RSI (14)", f"{latest_rsi:.1f}", rsi_signal)
+                        else:
+                            st.metric("RSI (14)", "N/A", "Insufficient data")
 
-                with col3:
-                    if 'ATR' in historical_data.columns and not historical_data['ATR'].empty:
-                        latest_atr = historical_data['ATR'].iloc[-1]
-                        if not pd.isna(latest_atr):
-                            st.metric("ATR (14)", f"${latest_atr:.2f}", "Volatility")
+                    with col2:
+                        if not pd.isna(latest_macd) and not pd.isna(latest_signal):
+                            macd_signal = "Bullish" if latest_macd > latest_signal else "Bearish"
+                            st.metric("MACD Signal", macd_signal, f"{latest_macd - latest_signal:.4f}")
                         else:
-                            st.metric("ATR (14)", "N/A", "Insufficient data")
+                            st.metric("MACD Signal", "N/A", "Insufficient data")
+
+                    with col3:
+                        if 'ATR' in historical_data.columns and not historical_data['ATR'].empty:
+                            latest_atr = historical_data['ATR'].iloc[-1]
+                            if not pd.isna(latest_atr):
+                                st.metric("ATR (14)", f"${latest_atr:.2f}", "Volatility")
+                            else:
+                                st.metric("ATR (14)", "N/A", "Insufficient data")
 
         with chart_tabs[2]:
-            st.subheader("Volume Analysis")
-            volume_chart = create_volume_analysis_chart(historical_data)
-            st.plotly_chart(volume_chart, use_container_width=True, key=f"chart_{ticker}_volume")
+            if chart_tabs[2].open:
+                st.subheader("Volume Analysis")
+                build, *args = chart_builds[2]
+                volume_chart = cached_chart(build, chart_data, chart_key, *args)
+                show_chart(volume_chart, key=f"chart_{ticker}_volume")
 
         with chart_tabs[3]:
-            st.subheader("Financial Overview")
-
-            # Key financial metrics
-            info = stock.info
-
-            col1, col2, col3, col4 = st.columns(4)
-            metrics = [
-                ("Market Cap", info.get('marketCap', 0), "B", 1e9),
-                ("Revenue", info.get('totalRevenue', 0), "B", 1e9),
-                ("P/E Ratio", info.get('trailingPE', 0), "", 1),
-                ("Dividend Yield", info.get('dividendYield', 0), "%", 100),
-                ("ROE", info.get('returnOnEquity', 0), "%", 100),
-                ("Profit Margin", info.get('profitMargins', 0), "%", 100),
-                ("Debt/Equity", info.get('debtToEquity', 0), "", 1),
-                ("Beta", info.get('beta', 0), "", 1)
-            ]
-
-            for i, (label, value, suffix, divisor) in enumerate(metrics):
-                col = [col1, col2, col3, col4][i % 4]
-                with col:
-                    if isinstance(value, (int, float)) and value != 0:
-                        formatted_value = f"{value/divisor:.2f}{suffix}" if divisor > 1 else f"{value:.2f}{suffix}"
-                    else:
-                        formatted_value = "N/A"
-                    st.metric(label, formatted_value)
+            if chart_tabs[3].open:
+                st.subheader("Financial Overview")
+
+                # Key financial metrics
+                col1, col2, col3, col4 = st.columns(4)
+                metrics = [
+                    ("Market Cap", snapshot.market_cap, "B", 1e9),
+                    ("Revenue", snapshot.total_revenue, "B", 1e9),
+                    ("P/E Ratio", snapshot.trailing_pe, "", 1),
+                    ("Dividend Yield", snapshot.dividend_yield, "%", 100),
+                    ("ROE", snapshot.return_on_equity, "%", 100),
+                    ("Profit Margin", snapshot.profit_margins, "%", 100),
+                    ("Debt/Equity", snapshot.debt_to_equity, "", 1),
+                    ("Beta", snapshot.beta, "", 1)
+                ]
+
+                for i, (label, value, suffix, divisor) in enumerate(metrics):
+                    col = [col1, col2, col3, col4][i % 4]
+                    with col:
+                        if isinstance(value, (int, float)) and value != 0:
+                            formatted_value = f"{value/divisor:.2f}{suffix}" if divisor > 1 else f"{value:.2f}{suffix}"
+                        else:
+                            formatted_value = "N/A"
+                        st.metric(label, formatted_value)
 
         with chart_tabs[4]:  # Market Heatmap tab
-            st.subheader("Stock Market Heatmap")
-
-            # Default list of tickers
-            default_tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "FB", "NFLX", "NVDA"]
-
-            # User selects tickers
-            selected_tickers = st.multiselect(
-                "Select stocks to include in heatmap",
-                options=default_tickers,
-                default=default_tickers,
-                key=f"multiselect_heatmap_{ticker}"
-)
+            if chart_tabs[4].open:
+                st.subheader("Stock Market Heatmap")
 
+                universe = heatmap_engine.universe()
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    scope = st.radio(
+                        "Universe",
+                        ["All stocks", "Custom selection"],
+                        horizontal=True,
+                        key=f"heatmap_scope_{ticker}"
+                    )
+                with col2:
+                    horizon = st.selectbox("Horizon", list(HEATMAP_HORIZONS), key=f"heatmap_horizon_{ticker}")
+
+                if scope == "Custom selection":
+                    default_tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NFLX", "NVDA"]
+                    selected_tickers = st.multiselect(
+                        "Select stocks to include in heatmap",
+                        options=universe,
+                        default=[t for t in default_tickers if t in universe],
+                        key=f"multiselect_heatmap_{ticker}"
+                    )
+                else:
+                    selected_tickers = universe
 
-            if selected_tickers:
-                heatmap_fig = stock_heatmap_chart(selected_tickers)
-                st.plotly_chart(heatmap_fig, use_container_width=True, key=f"heatmap_{ticker}")
-            else:
-                st.info("Please select at least one stock to display the heatmap.")
+                if selected_tickers:
+                    heatmap_table = heatmap_engine.compute(selected_tickers)
+                    if heatmap_table.empty:
+                        st.warning("No price data available for the selected stocks.")
+                    else:
+                        heatmap_fig = stock_heatmap_chart(heatmap_table, horizon)
+                        st.plotly_chart(heatmap_fig, use_container_width=True, key=f"heatmap_{ticker}")
+                        st.caption(f"{len(heatmap_table)} stocks · returns in % · tiles sized by average dollar volume")
+                        st.dataframe(sector_summary(heatmap_table), use_container_width=True)
+                else:
+                    st.info("Please select at least one stock to display the heatmap.")
 
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
         st.info("Please check the ticker symbol and try again.")
 
+    # Build the closed chart tabs' figures in the background, nearest tab first, so the next click is a cache hit
+    open_tab = next((i for i, tab in enumerate(chart_tabs) if tab.open), 0)
+    for i in sorted(range(len(chart_builds)), key=lambda i: abs(i - open_tab)):
+        if not chart_tabs[i].open:
+            build, *args = chart_builds[i]
+            prefetch_chart(build, chart_data, chart_key, *args)
+
     # Additional information sections
     if st.expander("📰 Recent News", expanded=False):
-        news = stock.news
+        news = bundle.news
         if news:
             valid_news_count = 0
             for item in news:
@@ -967,23 +1101,26 @@ def render_full_stock_dashboard(ticker, period):
             st.info("No recent news available")
 
     if st.expander("🏢 Company Information", expanded=False):
-        st.write(info.get('longBusinessSummary', 'No company information available.'))
+        st.write(snapshot.business_summary or 'No company information available.')
 
         col1, col2 = st.columns(2)
         with col1:
-            st.write(f"**Industry:** {info.get('industry', 'N/A')}")
-            st.write(f"**Employees:** {info.get('fullTimeEmployees', 'N/A'):,}")
-            st.write(f"**Founded:** {info.get('startDate', 'N/A')}")
+            employees = snapshot.full_time_employees
+            st.write(f"**Industry:** {snapshot.industry or 'N/A'}")
+            st.write(f"**Employees:** {f'{employees:,}' if employees is not None else 'N/A'}")
+            st.write(f"**Founded:** {snapshot.start_date or 'N/A'}")
 
         with col2:
-            st.write(f"**Website:** {info.get('website', 'N/A')}")
-            st.write(f"**Country:** {info.get('country', 'N/A')}")
-            st.write(f"**Currency:** {info.get('currency', 'N/A')}")
+            st.write(f"**Website:** {snapshot.website or 'N/A'}")
+            st.write(f"**Country:** {snapshot.country or 'N/A'}")
+            st.write(f"**Currency:** {snapshot.currency or 'N/A'}")
 
     # Stock Price Prediction
     st.header("🔮 Future Stock Price Prediction")
 
     days = st.number_input("Days to predict:", min_value=1, max_value=30, value=5, key=f"days_input_{ticker}")
+    model = st.selectbox("Forecast model:", list(MODEL_LABELS), format_func=MODEL_LABELS.get,
+                         key=f"model_select_{ticker}")
     predict_button = st.button("Predict Closing Prices", key=f"predict_button_{ticker}")
 
 
@@ -995,14 +1132,14 @@ def render_full_stock_dashboard(ticker, period):
                 if not ticker_symbol:
                     st.warning("Please enter a valid stock ticker symbol first.")
                 else:
-                    stock_obj = yf.Ticker(ticker_symbol)
-                    data = stock_obj.history(period="1y")
+                    data = bundle.prediction_history.copy()
 
                     if data.empty:
                         st.error(f"Not enough historical data for '{ticker_symbol}' to make a prediction.")
                     else:
                         data.reset_index(inplace=True)
-                        preds = predict_stock(data, days=days)
+                        preds = forecast_store.predict(ticker_symbol, data, days=days, model=model)
+                        st.session_state[f"preds_model_{ticker}"] = MODEL_LABELS[model]
 
                         st.session_state[f"preds_{ticker}"] = preds  
             except Exception as e:
@@ -1015,13 +1152,12 @@ def render_full_stock_dashboard(ticker, period):
                     st.info("• Try a major stock exchange symbol")
     if f"preds_{ticker}" in st.session_state:
         ticker_symbol = ticker
-        stock_obj = yf.Ticker(ticker_symbol)
         preds = st.session_state[f"preds_{ticker}"]
-        st.subheader(f"Predicted Closing Prices for {ticker.upper()}")
+        st.subheader(f"Predicted Closing Prices for {ticker.upper()} ({st.session_state[f'preds_model_{ticker}']})")
         st.dataframe(preds)
         st.subheader("Prediction Chart")
         fig2, ax = plt.subplots(figsize=(10, 5))
-        plot_data = stock_obj.history(period="1y")
+        plot_data = bundle.prediction_history
         ax.plot(plot_data.index, plot_data['Close'], label='Actual Close')
         ax.plot(preds['Date'], preds['Predicted_Close'], label='Predicted Close', linestyle='--')
         ax.set_xlabel("Date")
@@ -1030,6 +1166,119 @@ def render_full_stock_dashboard(ticker, period):
         ax.legend()
         st.pyplot(fig2)
 
+def calculate_comparison_metrics(closes):
+    """Compute comparison metrics for every ticker column of a close-price panel in one pass"""
+    returns = closes.pct_change(fill_method=None)
+    sma_20 = closes.rolling(window=20, min_periods=1).mean()
+    sma_50 = closes.rolling(window=50, min_periods=1).mean()
+
+    delta = closes.diff()
+    gain = delta.clip(lower=0).rolling(window=14).mean()
+    loss = (-delta.clip(upper=0)).rolling(window=14).mean()
+    rsi = 100 - (100 / (1 + gain / loss))
+
+    first = closes.bfill().iloc[0]
+    last = closes.ffill().iloc[-1]
+    metrics = pd.DataFrame({
+        "Last Price": last,
+        "Period Return (%)": (last / first - 1) * 100,
+        "vs SMA 20 (%)": (last / sma_20.ffill().iloc[-1] - 1) * 100,
+        "vs SMA 50 (%)": (last / sma_50.ffill().iloc[-1] - 1) * 100,
+        "RSI (14)": rsi.ffill().iloc[-1],
+        "Volatility (ann. %)": returns.std() * np.sqrt(252) * 100,
+        "Max Drawdown (%)": (closes / closes.cummax() - 1).min() * 100,
+    })
+    return metrics.sort_values("Period Return (%)", ascending=False).round(2)
+
+def create_comparison_chart(closes):
+    """Overlay every ticker's price normalized to 100 at the start of the period"""
+    normalized = closes / closes.bfill().iloc[0] * 100
+    fig = go.Figure()
+    for ticker in normalized.columns:
+        fig.add_trace(line_trace(normalized[ticker], mode='lines', name=ticker))
+    fig.add_hline(y=100, line_dash="dot", line_color="gray")
+    fig.update_layout(
+        title="Normalized Performance (start = 100)",
+        yaxis_title="Indexed Price",
+        template=pio.templates.default,
+        height=500,
+        hovermode="x unified"
+    )
+    return fig
+
+def render_multi_stock_comparison(tickers, period):
+    """Compare any number of tickers from one batched download"""
+    tickers = list(dict.fromkeys(tickers))
+    st.header(f"⚖️ Multi-Stock Comparison ({len(tickers)} stocks)")
+
+    frames = bar_store.history_many(tickers, period)
+    missing = [ticker for ticker, frame in frames.items() if frame.empty]
+    if missing:
+        st.warning(f"No data available for: {', '.join(missing)}")
+
+    closes = bar_panel(frames)
+    if closes.empty:
+        st.error("No data available for the selected stocks")
+        return
+
+    st.plotly_chart(create_comparison_chart(closes), use_container_width=True, key="chart_comparison")
+    st.subheader("📊 Comparison Metrics")
+    st.dataframe(calculate_comparison_metrics(closes), use_container_width=True)
+
+SCREEN_EXAMPLES = [
+    "RSI < 30 and MACD crosses above MACD_Signal",
+    "Close > SMA_200 and Volume_Ratio > 2",
+    "Close crosses above SMA_50",
+    "%K < 20 and %D < 20",
+]
+
+def render_stock_screener():
+    """Screen a whole universe of tickers against a technical condition"""
+    st.header("🔎 Technical Screener")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        example = st.selectbox("Example screens", SCREEN_EXAMPLES, key="screen_example")
+        condition = st.text_input(
+            "Condition",
+            value=example,
+            key=f"screen_condition_{example}",
+            help="Fields: " + ", ".join(SCREEN_FIELDS) + ". Combine with and/or/not; "
+                 "use 'crosses above'/'crosses below' for crossovers."
+        )
+    with col2:
+        rank_by = st.selectbox("Rank by", SCREEN_RESULT_COLUMNS, index=1, key="screen_rank_by")
+        ascending = st.checkbox("Ascending", value=False, key="screen_ascending")
+
+    source = st.radio("Universe", ["Important stocks", "Uploaded list"], horizontal=True, key="screen_universe")
+    if source == "Uploaded list":
+        uploaded = st.file_uploader("Symbols (CSV or text, one per line)", type=["csv", "txt"], key="screen_upload")
+        tickers = read_symbol_list(uploaded.getvalue().decode("utf-8", errors="ignore"), uploaded.name) if uploaded else []
+    else:
+        tickers = [label.split(" - ")[0] for label in IMPORTANT_STOCKS]
+    st.caption(f"{len(tickers)} symbols in universe")
+
+    if st.button("Run screen", key="run_screen", disabled=not tickers):
+        started = time.time()
+        try:
+            with st.spinner(f"Screening {len(tickers)} symbols..."):
+                st.session_state.screen_results = run_screen(condition, tickers, rank_by=rank_by, ascending=ascending)
+            st.session_state.screen_summary = (condition, len(tickers), time.time() - started)
+        except ScreenSyntaxError as e:
+            st.error(f"Invalid condition: {e}")
+
+    results = st.session_state.get("screen_results")
+    if results is not None:
+        screened, universe_size, elapsed = st.session_state.screen_summary
+        st.caption(f"{len(results)} of {universe_size} match `{screened}` · {elapsed:.1f}s")
+        st.dataframe(results, use_container_width=True)
+
+def refresh_market_data(ticker=None):
+    """Invalidate only fast-moving data (quotes, intraday and daily bars); info, news and search stay cached"""
+    market_cache.invalidate(kind="quote")
+    intraday_stream.invalidate(ticker)
+    bar_store.invalidate(ticker)
+
 def safe_rerun():
     try:
         st.experimental_rerun()
@@ -1050,7 +1299,10 @@ def main():
     def set_selected_ticker(ticker):
         st.session_state["selected_ticker"] = ticker
 
-    display_watchlist(selected_ticker_callback=set_selected_ticker)
+    # The checkbox is drawn further down the sidebar; its key carries the value from the previous run
+    auto_refresh = st.session_state.get("auto_refresh", False)
+    with st.sidebar:
+        live_fragment(display_watchlist, DEFAULT_TTLS["quote"], auto_refresh)(set_selected_ticker)
 
     with st.sidebar:
         st.header("⚙️ Configuration")
@@ -1102,38 +1354,61 @@ def main():
         selected_period = st.selectbox("📅 Time Period", list(period_options.keys()), index=6)
         period = period_options[selected_period]
 
+        chart_detail = st.selectbox(
+            "📉 Chart Detail", list(CHART_POINT_BUDGETS), key="chart_detail",
+            help="Long histories are downsampled to this many points per trace; zoom in for full resolution"
+        )
+
         if "show_multi_stock" not in st.session_state:
             st.session_state.show_multi_stock = False
 
+        if "show_screener" not in st.session_state:
+            st.session_state.show_screener = False
+
+        if st.button("🔎 Stock Screener"):
+            st.session_state.show_screener = not st.session_state.show_screener
+
         if st.button("Multi-Stock Comparison"):
             st.session_state.show_multi_stock = not st.session_state.show_multi_stock
 
-        stock1 = stock2 = None  # Always define at the top of sidebar/mode logic
+        compare_tickers = []  # Always define at the top of sidebar/mode logic
 
         if st.session_state.show_multi_stock:
-            col1, col2 = st.columns(2)
-            aapl_index = next(i for i, v in enumerate(IMPORTANT_STOCKS) if v.startswith("AAPL"))
-            msft_index = next(i for i, v in enumerate(IMPORTANT_STOCKS) if v.startswith("MSFT"))
-            with col1:
-                stock1_label = st.selectbox("Stock 1", options=IMPORTANT_STOCKS, index=aapl_index, key="stock1_select")
-            with col2:
-                stock2_label = st.selectbox("Stock 2", options=IMPORTANT_STOCKS, index=msft_index, key="stock2_select")
+            compare_labels = st.multiselect(
+                "Stocks to compare",
+                options=IMPORTANT_STOCKS,
+                default=[s for s in IMPORTANT_STOCKS if s.startswith(("AAPL - ", "MSFT - "))],
+                key="compare_select",
+                help="Pick any number of stocks; they are fetched together in one batched download"
+            )
 
             cols = st.columns([6, 1])
             with cols[1]:
                 if st.button("❌", key="exit_multistock", help="Exit Multi-Stock Comparison"):
                     st.session_state.show_multi_stock = False
                     safe_rerun()
-            stock1 = stock1_label.split(" - ")[0]
-            stock2 = stock2_label.split(" - ")[0]
+            compare_tickers = [label.split(" - ")[0] for label in compare_labels]
 
 
 
-        auto_refresh = st.checkbox("🔄 Auto Refresh (30s)", value=False)
+        auto_refresh = st.checkbox(
+            "🔄 Auto Refresh", value=False, key="auto_refresh",
+            help=f"Refresh watchlist quotes every {DEFAULT_TTLS['quote']}s and the live metrics and intraday "
+                 f"chart every {DEFAULT_TTLS['intraday']}s, without reloading the rest of the page"
+        )
+
+        flight_stats = market_flight.stats()
+        upstream_stats = upstream.metrics()
+        st.caption(
+            f"⚡ Upstream fetches: {flight_stats['fetches']} "
+            f"(duplicates saved: {flight_stats['shared']}) · "
+            f"queue wait avg {upstream_stats['wait_avg'] * 1000:.0f} ms, "
+            f"max {upstream_stats['wait_max'] * 1000:.0f} ms · "
+            f"retries: {upstream_stats['retries']}"
+        )
 
         if st.button("🔄 Refresh Now"):
-            st.cache_data.clear()
-            st.cache_resource.clear()
+            refresh_market_data()
 
     if "selected_ticker" in st.session_state and st.session_state["selected_ticker"]:
         ticker = st.session_state.pop("selected_ticker")
@@ -1142,25 +1417,15 @@ def main():
         st.warning("Please enter a stock ticker symbol")
         return
 
-    if auto_refresh:
-        if "last_refresh" not in st.session_state:
-            st.session_state.last_refresh = time.time()
-
-        current_time = time.time()
-        if current_time - st.session_state.last_refresh >= 30:
-            st.session_state.last_refresh = current_time
-            st.cache_data.clear()
-            st.rerun()
+    if st.session_state.get("show_screener"):
+        render_stock_screener()
+        return
 
-    if st.session_state.get("show_multi_stock") and stock1 and stock2:
-        col1, col2 = st.columns(2)
-        with col1:
-            render_full_stock_dashboard(stock1, period)
-        with col2:
-            render_full_stock_dashboard(stock2, period)
+    if st.session_state.get("show_multi_stock") and compare_tickers:
+        render_multi_stock_comparison(compare_tickers, period)
         return
     else:
-        render_full_stock_dashboard(ticker, period)
+        render_full_stock_dashboard(ticker, period, CHART_POINT_BUDGETS[chart_detail], live=auto_refresh)
 
 
 
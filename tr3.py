@@ -1,4 +1,3 @@
-import yfinance as yf
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
@@ -12,6 +11,7 @@ import json
 import pyperclip
 import os
 from typing import List, Dict, Any
+from market_data.providers import get_provider
 
 # Configure page
 st.set_page_config(
@@ -172,8 +172,7 @@ st.markdown("""
 def get_stock_info(ticker):
     """Get comprehensive stock information"""
     try:
-        stock = yf.Ticker(ticker)
-        return stock
+        return get_provider().info(ticker)
     except Exception as e:
         st.error(f"Error fetching stock data: {e}")
         return None
@@ -182,9 +181,8 @@ def get_stock_info(ticker):
 def get_real_time_data(ticker):
     """Get real-time stock data"""
     try:
-        stock = yf.Ticker(ticker)
         # Get intraday data for real-time feel
-        data = stock.history(period="1d", interval="1m")
+        data = get_provider().intraday(ticker, interval="1m")
         return data
     except Exception as e:
         st.error(f"Error fetching real-time data: {e}")